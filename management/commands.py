@@ -9,23 +9,98 @@ import sqlite3
 import logging
 import subprocess
 import signal
-from pathlib import Path
+import io
+import asyncio
 import json
 import traceback
 import platform
 import threading
-import queue
 from enum import Enum
 from typing import Optional, Dict, Any, List, Tuple
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import ThreadPoolExecutor
+
+# Resolved once at import; these are consulted on every output line
+_PLATFORM = platform.system()
+_IS_WINDOWS = _PLATFORM == "Windows"
+_IS_MACOS = _PLATFORM == "Darwin"
+_IS_LINUX = _PLATFORM == "Linux"
+
+# colorama is only needed for unified mode, so it is imported on first use
+# rather than on every CLI invocation; None means not yet attempted
+colorama_available: Optional[bool] = None
+Fore = Style = None
+
+
+def _ensure_colorama() -> bool:
+    """Import and initialise colorama once, reporting whether it is available"""
+    global colorama_available, Fore, Style
+    if colorama_available is None:
+        try:
+            import colorama
+        except ImportError:
+            colorama_available = False
+        else:
+            colorama.init()
+            Fore, Style = colorama.Fore, colorama.Style
+            colorama_available = True
+    return colorama_available
+
+
+def _line_formatter(prefix: str, suffix: str):
+    """Build a per-line formatter with the color branch resolved up front"""
+    if suffix:
+        return lambda line: prefix + line + suffix
+    return prefix.__add__
+
+
+def _server_formatters() -> Dict[str, Any]:
+    """Per-server line formatters, colored when colorama is available"""
+    if _ensure_colorama():
+        return {
+            "backend": _line_formatter(f"{Fore.BLUE}[BACKEND] ", Style.RESET_ALL),
+            "frontend": _line_formatter(f"{Fore.GREEN}[FRONTEND] ", Style.RESET_ALL),
+        }
+    return {
+        "backend": _line_formatter("[BACKEND] ", ""),
+        "frontend": _line_formatter("[FRONTEND] ", ""),
+    }
 
-try:
-    from colorama import init, Fore, Style
-    colorama_available = True
-except ImportError:
-    colorama_available = False
 
-from .pid_utils import save_pid, get_pid, get_pid_file, is_process_running, ensure_pid_dir
+def _use_pidfd_child_watcher() -> None:
+    """Let asyncio wait for child exits on pidfds instead of helper threads
+    
+    Before Python 3.12 the default watcher parks one thread in waitpid()
+    per subprocess. A pidfd is registered with the event loop's selector
+    instead, so both servers are watched from the loop's single thread.
+    Later versions pick the pidfd watcher on their own.
+    """
+    if _IS_WINDOWS or sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return
+    try:
+        # Kernels before 5.3 and some sandboxes refuse pidfd_open
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(asyncio.get_running_loop())
+    asyncio.set_child_watcher(watcher)
+
+
+def _take_lines(buf: bytearray) -> List[str]:
+    """Remove and decode every complete line held in a read buffer
+    
+    A trailing partial line is left in the buffer for the next read.
+    """
+    end = buf.rfind(b"\n")
+    if end < 0:
+        return []
+    lines = buf[:end].decode("utf-8", "replace").split("\n")
+    del buf[:end + 1]
+    return lines
+
+
+from .pid_utils import save_pid, get_pid, remove_pid_file, wait_for_exit
+from .process_utils import spawn, detach_kwargs, frontend_dir, resolve_exe, which
 from .server_utils import find_server_pid, kill_process, DEFAULT_BACKEND_PORT, DEFAULT_FRONTEND_PORT
 # Import new error handling
 from app.core.errors.management import (
@@ -33,9 +108,91 @@ from app.core.errors.management import (
 )
 from app.core.errors.base import ErrorContext, ErrorSeverity
 from app.core.errors.database import DatabaseError
-from .db_utils import init_db, run_migrations as run_db_migrations
+from .db_utils import DEFAULT_DB_PATH, init_db, run_migrations as run_db_migrations
 from app.core.logging import setup_logger
 
+# Inspection modules are resolved once; None marks an unavailable module
+_dbi_import_error = _ci_import_error = None
+try:
+    from . import db_inspection as _dbi
+except ImportError as e:
+    _dbi, _dbi_import_error = None, e
+try:
+    from . import content_inspection as _ci
+except ImportError as e:
+    _ci, _ci_import_error = None, e
+
+# Inspection entry points bound once so commands skip the module attribute lookup
+_borrow_conn = getattr(_dbi, "borrow_conn", None)
+_inspect_structure = getattr(_dbi, "check_db_structure", None)
+_explore_contents = getattr(_dbi, "explore_db_contents", None)
+_dump_database = getattr(_dbi, "dump_db_to_file", None)
+_inspect_chars = getattr(_ci, "check_characters", None)
+_inspect_images = getattr(_ci, "check_images", None)
+_inspect_content = getattr(_ci, "check_all", None)
+
+# Default rows per fetchmany() round trip, forwarded to the inspectors
+BATCH_SIZE = getattr(_dbi, "BATCH_SIZE", 1024)
+
+# Absolute paths for the database paths seen so far
+_DB_PATH_CACHE: Dict[str, str] = {}
+
+
+def _resolve_db(db_path: Optional[str] = None) -> str:
+    """Resolve a database path to an absolute path, remembering the result"""
+    key = db_path or DEFAULT_DB_PATH
+    resolved = _DB_PATH_CACHE.get(key)
+    if resolved is None:
+        resolved = _DB_PATH_CACHE[key] = os.path.abspath(key)
+    return resolved
+
+
+def _require_db(db_path, error_code, source):
+    """Resolve a database path and fail fast if it is not an existing file"""
+    resolved = _resolve_db(db_path)
+    # Checked on every call: the file may be deleted while a long-lived
+    # process such as the dashboard still remembers its path
+    if not os.path.isfile(resolved):
+        raise _db_err(_MSG_NOT_FOUND, error_code, source, db_path=resolved)
+    return resolved
+
+# Message templates for inspection command failures
+_MSG_IMPORT_FAIL = "Failed to import {} module"
+_MSG_NOT_FOUND = "Database file not found"
+_MSG_STRUCT_EMPTY = "Database file not found or structure invalid"
+_MSG_STRUCT_FAIL = "Failed to check database structure"
+_MSG_EXPLORE_EMPTY = "Database file not found or empty"
+_MSG_EXPLORE_FAIL = "Failed to explore database contents"
+_MSG_DUMP_EMPTY = "Database file not found or could not be dumped"
+_MSG_DUMP_FAIL = "Failed to dump database"
+_MSG_CHARS_EMPTY = "Database file not found or no character data available"
+_MSG_CHARS_FAIL = "Failed to check character information"
+_MSG_IMAGES_EMPTY = "Database file not found or no image data available"
+_MSG_IMAGES_FAIL = "Failed to check image information"
+_MSG_CONTENT_EMPTY = "Database file not found or no content data available"
+_MSG_CONTENT_FAIL = "Failed to check content information"
+_MSG_INSPECT_FAIL = "Failed to inspect database"
+_MSG_PARALLEL_FAIL = "Parallel inspection failed - {}"
+_SEV = ErrorSeverity.ERROR
+
+
+def _db_err(template, error_code, source, *args, db_path=None, exc=None):
+    """Build a DatabaseError for an inspection command from a message template"""
+    additional_data = {}
+    if db_path is not None:
+        additional_data["db_path"] = db_path
+    if exc is not None:
+        additional_data["error"] = str(exc)
+    return DatabaseError(
+        template.format(*args) if args else template,
+        error_code=error_code,
+        context=ErrorContext(
+            source=source,
+            severity=_SEV,
+            additional_data=additional_data
+        )
+    )
+
 # Setup logger only if it doesn't exist
 logger = logging.getLogger("management.commands")
 if not logger.handlers:
@@ -45,22 +202,18 @@ if not logger.handlers:
         log_file="logs/management.log"
     )
 
+# Log method used by handle_error for each error severity
+_SEVERITY_LOGGERS = {
+    ErrorSeverity.WARNING: logger.warning,
+    ErrorSeverity.ERROR: logger.error,
+    ErrorSeverity.CRITICAL: logger.critical,
+}
+
 def handle_error(error, exit_app=False):
-    """Handle server errors with standardized error context"""
-    error_context = ErrorContext(
-        source="management",
-        severity=error.error_context.severity if hasattr(error, 'error_context') else ErrorSeverity.ERROR,
-        timestamp=error.error_context.timestamp if hasattr(error, 'error_context') else None,
-        error_id=error.error_context.error_id if hasattr(error, 'error_context') else None,
-        additional_data=error.error_context.additional_data if hasattr(error, 'error_context') else {}
-    )
-    
-    if error_context.severity == ErrorSeverity.WARNING:
-        logger.warning(str(error))
-    elif error_context.severity == ErrorSeverity.ERROR:
-        logger.error(str(error))
-    elif error_context.severity == ErrorSeverity.CRITICAL:
-        logger.critical(str(error))
+    """Log a server error at the severity recorded in its error context"""
+    ec = getattr(error, 'error_context', None)
+    severity = ec.severity if ec is not None else ErrorSeverity.ERROR
+    _SEVERITY_LOGGERS.get(severity, logger.error)(str(error))
         
     if exit_app:
         logger.info("Exiting due to error.")
@@ -70,9 +223,7 @@ def handle_error(error, exit_app=False):
 async def start_concurrent_mode(args):
     """Run both servers concurrently in the same terminal with color-coded output"""
     # Initialize colorama for cross-platform colored terminal output
-    if colorama_available:
-        init()
-    else:
+    if not _ensure_colorama():
         logger.warning("colorama not installed. Output will not be color-coded.")
         logger.warning("To install: pip install colorama")
     
@@ -88,7 +239,7 @@ async def start_concurrent_mode(args):
         current_dir = os.getcwd()
         venv_path = os.path.join(current_dir, '.venv')
         
-        if platform.system() == "Darwin":  # macOS
+        if _IS_MACOS:
             # Create the command that will run in the new terminal
             # First activate venv, then run the servers
             cmd = f"cd '{current_dir}' && "
@@ -111,7 +262,7 @@ async def start_concurrent_mode(args):
                 # Fall back to regular mode if terminal creation fails
                 logger.warning("Falling back to regular unified mode...")
         
-        elif platform.system() == "Windows":
+        elif _IS_WINDOWS:
             # Escape any spaces in the path for Windows
             current_dir_escaped = current_dir.replace(" ", "^ ")
             venv_activate = os.path.join(current_dir_escaped, '.venv', 'Scripts', 'activate.bat')
@@ -138,15 +289,7 @@ async def start_concurrent_mode(args):
         else:  # Linux or other Unix-like systems
             # Try to detect the available terminal emulator
             terminals = ["gnome-terminal", "xterm", "konsole"]
-            terminal_found = None
-            
-            for term in terminals:
-                try:
-                    subprocess.run(["which", term], check=True, capture_output=True)
-                    terminal_found = term
-                    break
-                except subprocess.CalledProcessError:
-                    continue
+            terminal_found = next((term for term in terminals if which(term)), None)
             
             if terminal_found:
                 # Create the command that will run in the new terminal
@@ -210,13 +353,42 @@ async def start_concurrent_mode(args):
             logger.error("Flask is not installed. Cannot start dashboard.")
             logger.error("Install with: pip install flask")
     
-    # Create message queues for each server's output
-    backend_queue = queue.Queue()
-    frontend_queue = queue.Queue()
-    stop_event = threading.Event()
+    # Resolved once up front; the CLI's own working directory is never changed
+    frontend_path = frontend_dir()
+    
+    # Colors are applied once per batch as the output is written
+    formatters = _server_formatters()
+    
+    def write_lines(server, lines):
+        sys.stdout.write("\n".join(map(formatters[server], lines)) + "\n")
+        sys.stdout.flush()
+    
+    async def launch(server, cmd, cwd=None):
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=cwd,
+            **detach_kwargs(args.detach)
+        )
+        save_pid(server, process.pid)
+        return process
+    
+    # Copy one server's output to the terminal, a pipe read at a time
+    async def pump(server, process):
+        read = process.stdout.read
+        buf = bytearray()
+        while chunk := await read(1 << 16):
+            buf += chunk
+            lines = _take_lines(buf)
+            if lines:
+                write_lines(server, [line.rstrip("\r") for line in lines])
+        if buf:
+            write_lines(server, [buf.decode("utf-8", "replace").rstrip("\r")])
+        await process.wait()
     
-    # Function to start the backend server and capture its output
-    def run_backend():
+    # Function to start the backend server and stream its output
+    async def run_backend():
         cmd = [
             "uvicorn", 
             "app.main:app", 
@@ -224,209 +396,32 @@ async def start_concurrent_mode(args):
             "--host", "0.0.0.0", 
             "--port", str(args.backend_port)
         ]
-
-        # Set up detached process flags based on platform
-        if args.detach:
-            if platform.system() == "Windows":
-                creationflags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                    creationflags=creationflags
-                )
-            else:
-                # On Unix-like systems, use nohup but keep output visible
-                cmd = ["nohup"] + cmd
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                    preexec_fn=os.setpgrp
-                )
-        else:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-
-        save_pid("backend", process.pid)
-        
         try:
-            # Process output until the process ends or stop_event is set
-            for line in iter(process.stdout.readline, ''):
-                if stop_event.is_set():
-                    process.terminate()
-                    break
-                
-                if colorama_available:
-                    backend_queue.put(f"{Fore.BLUE}[BACKEND] {line.rstrip()}{Style.RESET_ALL}")
-                else:
-                    backend_queue.put(f"[BACKEND] {line.rstrip()}")
-            
-            # Clean up when the process ends
-            process.wait()
-        except Exception as e:
-            backend_queue.put(f"[BACKEND] ERROR: {str(e)}")
-            process.terminate()
-        finally:
-            backend_queue.put(None)  # Signal that this process is done
-    
-    # Function to start the frontend server and capture its output
-    def run_frontend():
-        frontend_dir = Path("frontend").resolve()
-        if not frontend_dir.exists():
-            frontend_queue.put("[FRONTEND] ERROR: Frontend directory not found")
-            frontend_queue.put(None)  # Signal that this process is done
-            return
-        
-        original_dir = os.getcwd()
-        os.chdir(frontend_dir)
-        
-        # Try to find full path to npm on Windows
-        npm_cmd = "npm"
-        if platform.system() == "Windows":
-            try:
-                npm_path = subprocess.check_output(["where", "npm"], shell=True).decode('utf-8').split('\n')[0].strip()
-                if npm_path:
-                    npm_cmd = npm_path
-                    frontend_queue.put(f"[FRONTEND] Found npm at: {npm_path}")
-            except Exception as e:
-                frontend_queue.put(f"[FRONTEND] Warning: Could not find npm in PATH: {str(e)}")
-                frontend_queue.put("[FRONTEND] Trying system default npm or using shell=True...")
-        
-        cmd = [npm_cmd, "run", "dev"]
-
-        try:
-            # Set up detached process flags based on platform
-            if args.detach:
-                if platform.system() == "Windows":
-                    creationflags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        bufsize=1,
-                        universal_newlines=True,
-                        cwd=str(frontend_dir),
-                        creationflags=creationflags,
-                        shell=True
-                    )
-                else:
-                    # On Unix-like systems, use nohup but keep output visible
-                    cmd = ["nohup"] + cmd
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        bufsize=1,
-                        universal_newlines=True,
-                        shell=True,
-                        cwd=str(frontend_dir),
-                        preexec_fn=os.setpgrp
-                    )
-            else:
-                if platform.system() == "Windows":
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        bufsize=1,
-                        universal_newlines=True,
-                        cwd=str(frontend_dir),
-                        shell=True
-                    )
-                else:
-                    process = subprocess.Popen(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        bufsize=1,
-                        universal_newlines=True,
-                        cwd=str(frontend_dir)
-                    )
-            
-            save_pid("frontend", process.pid)
-            
-            try:
-                # Process output until the process ends or stop_event is set
-                for line in iter(process.stdout.readline, ''):
-                    if stop_event.is_set():
-                        process.terminate()
-                        break
-                    
-                    if colorama_available:
-                        frontend_queue.put(f"{Fore.GREEN}[FRONTEND] {line.rstrip()}{Style.RESET_ALL}")
-                    else:
-                        frontend_queue.put(f"[FRONTEND] {line.rstrip()}")
-                
-                # Clean up when the process ends
-                process.wait()
-            except Exception as e:
-                frontend_queue.put(f"[FRONTEND] ERROR: {str(e)}")
-                process.terminate()
-            finally:
-                frontend_queue.put(None)  # Signal that this process is done
-
-        except Exception as e:
-            frontend_queue.put(f"[FRONTEND] ERROR: {str(e)}")
-            frontend_queue.put(f"[FRONTEND] This may be due to npm not being in your PATH or not being installed.")
-            frontend_queue.put(f"[FRONTEND] Check that you can run 'npm --version' from your terminal.")
-        finally:
-            os.chdir(original_dir)
-            frontend_queue.put(None)  # Signal that this process is done
-    
-    # Function to print messages from the queues
-    def print_output():
-        backend_done = False
-        frontend_done = False
+            process = await launch("backend", cmd)
+        except OSError as e:
+            write_lines("backend", [f"ERROR: {str(e)}"])
+            return None
+        return process
+    
+    # Function to start the frontend server and stream its output
+    async def run_frontend():
+        if frontend_path is None:
+            write_lines("frontend", ["ERROR: Frontend directory not found"])
+            return None
         
+        cmd = [resolve_exe("npm"), "run", "dev"]
         try:
-            while not (backend_done and frontend_done):
-                if stop_event.is_set():
-                    break
-                
-                # Check backend queue
-                try:
-                    line = backend_queue.get(block=False)
-                    if line is None:
-                        backend_done = True
-                    else:
-                        print(line, flush=True)
-                except queue.Empty:
-                    pass
-                
-                # Check frontend queue
-                try:
-                    line = frontend_queue.get(block=False)
-                    if line is None:
-                        frontend_done = True
-                    else:
-                        print(line, flush=True)
-                except queue.Empty:
-                    pass
-                
-                # Brief pause to prevent CPU spinning
-                time.sleep(0.05)
-        except KeyboardInterrupt:
-            stop_event.set()
-            logger.info("Stopping servers...")
+            process = await launch("frontend", cmd, cwd=frontend_path)
+        except OSError as e:
+            write_lines("frontend", [
+                f"ERROR: {str(e)}",
+                "This may be due to npm not being in your PATH or not being installed.",
+                "Check that you can run 'npm --version' from your terminal.",
+            ])
+            return None
+        return process
     
-    # Start all threads
+    # Start both servers
     if args.detach:
         logger.info("Starting servers in detached mode (with output)...")
     else:
@@ -438,30 +433,39 @@ async def start_concurrent_mode(args):
             logger.info(f"Backend will be prefixed with [BACKEND], Frontend with [FRONTEND]")
         logger.info(f"Press Ctrl+C to stop both servers")
     
-    backend_thread = threading.Thread(target=run_backend)
-    frontend_thread = threading.Thread(target=run_frontend)
-    output_thread = threading.Thread(target=print_output)
-    
-    backend_thread.daemon = True
-    frontend_thread.daemon = True
-    output_thread.daemon = True
+    _use_pidfd_child_watcher()
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
     
-    backend_thread.start()
-    frontend_thread.start()
-    output_thread.start()
-    
-    try:
-        # Keep the main thread alive until both servers are done or user interrupts
-        while (backend_thread.is_alive() or frontend_thread.is_alive()) and not stop_event.is_set():
-            time.sleep(0.5)
-    except KeyboardInterrupt:
+    # Ctrl+C only needs to wake the event loop; shutdown happens below
+    def handle_sigint(sig, frame):
         logger.info("Stopping all servers...")
-        stop_event.set()
+        loop.call_soon_threadsafe(stop_requested.set)
     
-    # Wait for threads to finish
-    backend_thread.join(timeout=2)
-    frontend_thread.join(timeout=2)
-    output_thread.join(timeout=1)
+    previous_sigint = signal.signal(signal.SIGINT, handle_sigint)
+    try:
+        processes = {
+            "backend": await run_backend(),
+            "frontend": await run_frontend(),
+        }
+        running = {server: proc for server, proc in processes.items() if proc is not None}
+        pumps = asyncio.gather(*(pump(server, proc) for server, proc in running.items()))
+        stopper = asyncio.ensure_future(stop_requested.wait())
+        
+        # Sleep until both servers are done or the user interrupts
+        await asyncio.wait({pumps, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        stopper.cancel()
+        
+        if not pumps.done():
+            for proc in running.values():
+                if proc.returncode is None:
+                    proc.terminate()
+            try:
+                await asyncio.wait_for(pumps, timeout=2)
+            except asyncio.TimeoutError:
+                logger.warning("Servers did not shut down within 2 seconds")
+    finally:
+        signal.signal(signal.SIGINT, previous_sigint)
     
     # Don't remove PID files here - let stop_server handle cleanup
     if args.detach:
@@ -485,30 +489,11 @@ async def start_backend(args):
     ]
     
     try:
-        # Set up detached process flags based on platform
+        process = spawn(cmd, detach=args.detach)
         if args.detach:
-            if platform.system() == "Windows":
-                creationflags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    creationflags=creationflags
-                )
-            else:
-                # On Unix-like systems, use nohup and redirect output
-                cmd = ["nohup"] + cmd + [">/dev/null", "2>&1", "&"]
-                process = subprocess.Popen(
-                    " ".join(cmd),
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    shell=True,
-                    preexec_fn=os.setpgrp
-                )
             save_pid("backend", process.pid)
             logger.info(f"Backend server started in detached mode (PID: {process.pid}).")
         else:
-            process = subprocess.Popen(cmd)
             save_pid("backend", process.pid)
             logger.info(f"Backend server started (PID: {process.pid}).")
             
@@ -529,65 +514,22 @@ async def start_frontend(args):
     if get_pid("frontend"):
         raise ServerError("Frontend server is already running", server="frontend")
     
-    frontend_dir = Path("frontend").resolve()
-    if not frontend_dir.exists():
+    frontend_path = frontend_dir()
+    if frontend_path is None:
         raise ServerError("Frontend directory not found", server="frontend")
     
     logger.info(f"Starting frontend server...")
     
-    # Try to find full path to npm on Windows
-    npm_cmd = "npm"
-    if platform.system() == "Windows":
-        try:
-            # Check if npm exists in PATH
-            npm_path = subprocess.check_output(["where", "npm"], shell=True).decode('utf-8').split('\n')[0].strip()
-            if npm_path:
-                npm_cmd = npm_path
-                logger.info(f"Found npm at: {npm_path}")
-        except Exception as e:
-            logger.warning(f"Could not find npm in PATH: {str(e)}")
-            logger.warning("Trying system default npm or using shell=True...")
+    npm_cmd = resolve_exe("npm")
     
     cmd = [npm_cmd, "run", "dev"]
     
     try:
-        # Set up detached process flags based on platform
+        process = spawn(cmd, detach=args.detach, cwd=frontend_path)
         if args.detach:
-            if platform.system() == "Windows":
-                creationflags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    cwd=str(frontend_dir),
-                    creationflags=creationflags,
-                    shell=True
-                )
-            else:
-                # On Unix-like systems, use nohup and redirect output
-                cmd = ["nohup"] + cmd + [">/dev/null", "2>&1", "&"]
-                process = subprocess.Popen(
-                    " ".join(cmd),
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    shell=True,
-                    cwd=str(frontend_dir),
-                    preexec_fn=os.setpgrp
-                )
             save_pid("frontend", process.pid)
             logger.info(f"Frontend server started in detached mode (PID: {process.pid}).")
         else:
-            if platform.system() == "Windows":
-                process = subprocess.Popen(
-                    cmd,
-                    cwd=str(frontend_dir),
-                    shell=True
-                )
-            else:
-                process = subprocess.Popen(
-                    cmd,
-                    cwd=str(frontend_dir)
-                )
             save_pid("frontend", process.pid)
             logger.info(f"Frontend server started (PID: {process.pid}).")
             
@@ -604,7 +546,12 @@ async def start_frontend(args):
 
 @with_management_error_handling
 async def stop_server(server_type, force=False):
-    """Stop a server by type"""
+    """Stop a server by type
+    
+    Returns:
+        True once the server is gone (or is a marker with no process to wait
+        on), False if it was still running when the exit wait timed out
+    """
     pid = get_pid(server_type)
     if not pid:
         raise ProcessError(f"{server_type.title()} server is not running", pid=pid)
@@ -615,14 +562,12 @@ async def stop_server(server_type, force=False):
         logger.info("Please close the frontend server window manually.")
         
         # Clean up PID file
-        pid_file = get_pid_file(server_type)
-        if os.path.exists(pid_file):
-            try:
-                os.remove(pid_file)
-                logger.info("Removed frontend PID marker file.")
-            except OSError as e:
-                logger.warning(f"Failed to remove PID file: {str(e)}")
-        return
+        try:
+            remove_pid_file(server_type)
+            logger.info("Removed frontend PID marker file.")
+        except Exception as e:
+            logger.warning(f"Failed to remove PID file: {str(e)}")
+        return True
     
     # Special handling for backend running in an external window on Windows
     if server_type == "backend" and pid == 88888:
@@ -630,14 +575,24 @@ async def stop_server(server_type, force=False):
         logger.info("Please close the backend server window manually.")
         
         # Clean up PID file
-        pid_file = get_pid_file(server_type)
-        if os.path.exists(pid_file):
+        try:
+            remove_pid_file(server_type)
+            logger.info("Removed backend PID marker file.")
+        except Exception as e:
+            logger.warning(f"Failed to remove PID file: {str(e)}")
+        return True
+    
+    # On Linux a missing /proc entry means the PID file is stale; nothing to signal
+    if _IS_LINUX:
+        try:
+            os.stat(f"/proc/{pid}")
+        except FileNotFoundError:
+            logger.info(f"{server_type.capitalize()} server (PID: {pid}) is not running; removing stale PID file.")
             try:
-                os.remove(pid_file)
-                logger.info("Removed backend PID marker file.")
-            except OSError as e:
+                remove_pid_file(server_type)
+            except Exception as e:
                 logger.warning(f"Failed to remove PID file: {str(e)}")
-        return
+            return True
     
     logger.info(f"Stopping {server_type} server (PID: {pid})...")
     
@@ -648,16 +603,15 @@ async def stop_server(server_type, force=False):
         if success:
             logger.info(f"{server_type.capitalize()} server stopped.")
             
-            # Only remove PID file if process is no longer running
-            if not is_process_running(pid):
-                pid_file = get_pid_file(server_type)
-                if os.path.exists(pid_file):
-                    try:
-                        os.remove(pid_file)
-                    except OSError as e:
-                        logger.warning(f"Failed to remove PID file: {str(e)}")
-            else:
-                logger.info(f"{server_type.capitalize()} server is still running in unified mode.")
+            # Only remove PID file once the process has actually exited
+            if wait_for_exit(pid, timeout=5.0):
+                try:
+                    remove_pid_file(server_type)
+                except Exception as e:
+                    logger.warning(f"Failed to remove PID file: {str(e)}")
+                return True
+            logger.info(f"{server_type.capitalize()} server is still running in unified mode.")
+            return False
         else:
             raise ServerError(f"Failed to stop server", server_type, 
                             ErrorSeverity.ERROR,
@@ -669,7 +623,10 @@ async def stop_server(server_type, force=False):
 @with_management_error_handling
 async def restart_server(server_type, args):
     """Restart a server by type"""
-    await stop_server(server_type)
+    if not await stop_server(server_type):
+        # Starting now would race the old process for its port
+        logger.error(f"{server_type.capitalize()} server did not exit in time; not restarting it.")
+        return
     if server_type == "backend":
         await start_backend(args)
     else:
@@ -679,7 +636,6 @@ async def restart_server(server_type, args):
 async def run_db_init():
     """Initialize the database"""
     try:
-        from .db_utils import init_db
         init_db()  # init_db is synchronous, so no await needed
     except Exception as e:
         raise DatabaseError(
@@ -696,7 +652,6 @@ async def run_db_init():
 async def run_migrations():
     """Run database migrations"""
     try:
-        from .db_utils import run_migrations as run_db_migrations
         run_db_migrations()  # synchronous function, no await needed
     except Exception as e:
         raise DatabaseError(
@@ -709,161 +664,198 @@ async def run_migrations():
             )
         )
 
-@with_management_error_handling
-async def check_db_structure(db_path=None, verbose=False):
-    """Check database structure"""
-    if not db_path:
-        raise DatabaseError(
-            "Database path not provided",
-            error_code="DATABASE-CHECK-MISSING-PATH-001",
-            context=ErrorContext(
-                source="check_db_structure",
-                severity=ErrorSeverity.ERROR,
-                additional_data={}
-            )
-        )
+def _log_done(message, command, db_path, t0):
+    """Log a single completion record carrying the command duration"""
+    # Skip the timing maths and record construction when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    duration_ms = (time.perf_counter() - t0) * 1000
+    logger.info(
+        f"{message} ({duration_ms:.1f} ms)",
+        extra={"command": command, "db_path": db_path, "duration_ms": duration_ms}
+    )
 
-    try:
-        from .db_inspection import check_db_structure as inspect_structure
-        
-        logger.info("Checking database structure...")
-        try:
-            result = inspect_structure(db_path)
-            logger.info("Database structure check completed.")
-            return True
-        except FileNotFoundError as e:
-            db_file = db_path or "storybook.db"
-            raise DatabaseError(
-                f"Failed to check database structure - {str(e)}",
-                error_code="DATABASE-CHECK-FILE-NOT-FOUND-001",
-                context=ErrorContext(
-                    source="check_db_structure",
-                    severity=ErrorSeverity.ERROR,
-                    additional_data={"db_path": db_file}
-                )
+def _unavailable_cmd(func_name, entity, module_name, import_error, doc=None):
+    """Build a command stub that fails because an inspection module is missing"""
+    async def command(db_path=None, *args):
+        raise _db_err(_MSG_IMPORT_FAIL, f"DATABASE-{entity}-IMPORT-ERROR-001",
+                      func_name, module_name, exc=import_error) from import_error
+    
+    command.__name__ = command.__qualname__ = func_name
+    command.__doc__ = doc
+    return command
+
+def _inspect_pooled(inspect, db_path, *args, fetch_batch=BATCH_SIZE):
+    """Run one inspection function on a pooled connection"""
+    with _borrow_conn(db_path) as conn:
+        return inspect(db_path, *args, conn=conn, fetch_batch=fetch_batch)
+
+def _make_inspection_cmd(inspect, module_name, func_name, entity, done_msg,
+                         empty_msg, fail_msg, defaults=(), compat=(), doc=None,
+                         import_error=None):
+    """Build an async command wrapping one inspection function
+    
+    Args:
+        inspect: Inspection function, or None if its module could not be imported
+        module_name: Module name used in the import error message
+        func_name: Command name, matching the inspection function it wraps
+        entity: Error code entity, e.g. "EXPLORE" for DATABASE-EXPLORE-*
+        done_msg: Log message on success, formatted with the forwarded args
+        empty_msg: Error message when the inspection returns False
+        fail_msg: Error message when the inspection raises
+        defaults: Defaults for the positional args forwarded after db_path
+        compat: Names of trailing positional args kept only for backwards
+            compatibility; they are accepted but not forwarded. Any further
+            positional args raise TypeError
+        doc: Command docstring
+        import_error: The ImportError raised by the module, if any
+    
+    If the inspection function is unavailable the command is a stub that
+    raises the import failure straight away.
+    """
+    if inspect is None:
+        return _unavailable_cmd(func_name, entity, module_name, import_error, doc)
+    
+    code = f"DATABASE-{entity}"
+    nargs = len(defaults)
+    max_args = 1 + nargs + len(compat)
+    
+    async def command(db_path=None, *args, fetch_batch=BATCH_SIZE):
+        if 1 + len(args) > max_args:
+            raise TypeError(
+                f"{func_name}() takes at most {max_args} positional arguments "
+                f"but {1 + len(args)} were given"
             )
-    except ImportError:
-        raise DatabaseError(
-            "Failed to import db_inspection module",
-            error_code="DATABASE-CHECK-IMPORT-ERROR-001",
-            context=ErrorContext(
-                source="check_db_structure",
-                severity=ErrorSeverity.ERROR,
-                additional_data={}
+        t0 = time.perf_counter()
+        try:
+            db_path = _require_db(db_path, f"{code}-FILE-NOT-FOUND-001", func_name)
+            call_args = args[:nargs] + defaults[len(args):]
+            # SQLite reads block, so run them off the event loop
+            result = await asyncio.to_thread(
+                _inspect_pooled, inspect, db_path, *call_args, fetch_batch=fetch_batch
             )
-        )
+            if result is False:
+                raise _db_err(empty_msg, f"{code}-NOT-FOUND-001", func_name, db_path=db_path)
+            
+            _log_done(done_msg.format(*call_args), func_name, db_path, t0)
+            return True
+        except DatabaseError:
+            # Already logged when it was constructed
+            raise
+        except Exception as e:
+            raise _db_err(fail_msg, f"{code}-FAILURE-001", func_name,
+                          db_path=db_path, exc=e) from e
+    
+    command.__name__ = command.__qualname__ = func_name
+    command.__doc__ = doc
+    return command
 
-@with_management_error_handling
-async def explore_db_contents(db_path=None):
-    """Explore the database contents"""
-    try:
-        from .db_inspection import explore_db_contents as explore_contents
-        
-        logger.info("Exploring database contents...")
-        result = explore_contents(db_path)
-        
-        if result is False:
-            db_file = db_path or "storybook.db"
-            raise DatabaseError(f"Database file not found or empty", 
-                             db_path=db_file,
-                             severity=ErrorSeverity.ERROR)
-            return False
-                             
-        logger.info("Database exploration completed.")
-        return True
-    except ImportError:
-        raise DatabaseError("Failed to import db_inspection module", 
-                          severity=ErrorSeverity.ERROR)
-        return False
-    except Exception as e:
-        raise DatabaseError("Failed to explore database contents", 
-                          db_path=db_path,
-                          severity=ErrorSeverity.ERROR, 
-                          details=str(e))
-        return False
+check_db_structure = _make_inspection_cmd(
+    _inspect_structure, "db_inspection", "check_db_structure", "CHECK",
+    "Database structure check completed.",
+    _MSG_STRUCT_EMPTY, _MSG_STRUCT_FAIL, compat=("verbose",),
+    doc="Check database structure", import_error=_dbi_import_error
+)
+explore_db_contents = _make_inspection_cmd(
+    _explore_contents, "db_inspection", "explore_db_contents", "EXPLORE",
+    "Database exploration completed.",
+    _MSG_EXPLORE_EMPTY, _MSG_EXPLORE_FAIL,
+    doc="Explore the database contents", import_error=_dbi_import_error
+)
+dump_db_to_file = _make_inspection_cmd(
+    _dump_database, "db_inspection", "dump_db_to_file", "DUMP",
+    "Database dump to {} completed.",
+    _MSG_DUMP_EMPTY, _MSG_DUMP_FAIL, defaults=("db_dump.txt",),
+    doc="Dump the database contents to a file", import_error=_dbi_import_error
+)
+check_characters = _make_inspection_cmd(
+    _inspect_chars, "content_inspection", "check_characters", "CHARACTERS",
+    "Character check completed.",
+    _MSG_CHARS_EMPTY, _MSG_CHARS_FAIL,
+    doc="Check character information in the database", import_error=_ci_import_error
+)
+check_images = _make_inspection_cmd(
+    _inspect_images, "content_inspection", "check_images", "IMAGES",
+    "Image check completed.",
+    _MSG_IMAGES_EMPTY, _MSG_IMAGES_FAIL,
+    doc="Check image information in the database", import_error=_ci_import_error
+)
+check_content = _make_inspection_cmd(
+    _inspect_content, "content_inspection", "check_content", "CONTENT",
+    "Content check completed.",
+    _MSG_CONTENT_EMPTY, _MSG_CONTENT_FAIL,
+    doc="Check characters and images together in one pass over stories",
+    import_error=_ci_import_error
+)
 
-@with_management_error_handling
-async def dump_db_to_file(db_path=None, output_file="db_dump.txt"):
-    """Dump the database contents to a file"""
+async def inspect_all(db_path=None, fetch_batch=BATCH_SIZE):
+    """Run every database and content inspection over a single connection"""
+    t0 = time.perf_counter()
     try:
-        from .db_inspection import dump_db_to_file as dump_database
+        db_path = _require_db(db_path, "DATABASE-INSPECT-FILE-NOT-FOUND-001", "inspect_all")
         
-        logger.info(f"Dumping database to {output_file}...")
-        result = dump_database(db_path, output_file)
+        def run_all():
+            with _borrow_conn(db_path) as conn:
+                _inspect_structure(db_path, conn=conn, fetch_batch=fetch_batch)
+                _explore_contents(db_path, conn=conn, fetch_batch=fetch_batch)
+                _inspect_chars(db_path, conn=conn, fetch_batch=fetch_batch)
+                _inspect_images(db_path, conn=conn, fetch_batch=fetch_batch)
         
-        if result is False:
-            db_file = db_path or "storybook.db"
-            raise DatabaseError(f"Database file not found or could not be dumped", 
-                             db_path=db_file,
-                             severity=ErrorSeverity.ERROR)
-            return False
-                             
-        logger.info("Database dump completed.")
-        return True
-    except ImportError:
-        raise DatabaseError("Failed to import db_inspection module", 
-                          severity=ErrorSeverity.ERROR)
-    except Exception as e:
-        raise DatabaseError("Failed to dump database", 
-                          db_path=db_path,
-                          severity=ErrorSeverity.ERROR, 
-                          details=str(e))
-        return False
-
-@with_management_error_handling
-async def check_characters(db_path=None):
-    """Check character information in the database"""
-    try:
-        from .content_inspection import check_characters as inspect_chars
-        
-        logger.info("Checking character information...")
-        result = inspect_chars(db_path)
+        # SQLite reads block, so run them off the event loop
+        await asyncio.to_thread(run_all)
         
-        if result is False:
-            db_file = db_path or "storybook.db"
-            raise DatabaseError(f"Database file not found or no character data available", 
-                             db_path=db_file,
-                             severity=ErrorSeverity.ERROR)
-            return False
-                             
-        logger.info("Character check completed.")
+        _log_done("Full database inspection completed.", "inspect_all", db_path, t0)
         return True
-    except ImportError:
-        raise DatabaseError("Failed to import content_inspection module", 
-                          severity=ErrorSeverity.ERROR)
-        return False
+    except DatabaseError:
+        # Already logged when it was constructed
+        raise
     except Exception as e:
-        raise DatabaseError("Failed to check character information", 
-                          db_path=db_path,
-                          severity=ErrorSeverity.ERROR, 
-                          details=str(e))
-        return False
+        raise _db_err(_MSG_INSPECT_FAIL, "DATABASE-INSPECT-FAILURE-001",
+                      "inspect_all", db_path=db_path, exc=e) from e
 
-@with_management_error_handling
-async def check_images(db_path=None):
-    """Check image information in the database"""
+def _run_inspection(inspect, db_path, fetch_batch):
+    """Run one inspector on its own pooled connection, capturing its report"""
+    out = io.StringIO()
+    with _borrow_conn(db_path) as conn:
+        inspect(db_path, conn=conn, out=out, fetch_batch=fetch_batch)
+    return out.getvalue()
+
+async def inspect_all_parallel(db_path=None, fetch_batch=BATCH_SIZE):
+    """Run the structure, character and image inspections concurrently
+    
+    The inspections are independent read-only queries, so each runs in a
+    worker thread on its own pooled connection. Reports are buffered per
+    worker and printed in a fixed order once all of them have finished.
+    """
+    t0 = time.perf_counter()
     try:
-        from .content_inspection import check_images as inspect_images
+        db_path = _require_db(db_path, "DATABASE-INSPECT-FILE-NOT-FOUND-001", "inspect_all_parallel")
         
-        logger.info("Checking image information...")
-        result = inspect_images(db_path)
+        loop = asyncio.get_running_loop()
+        inspectors = (_inspect_structure, _inspect_chars, _inspect_images)
+        with ThreadPoolExecutor(max_workers=len(inspectors)) as pool:
+            reports = await asyncio.gather(*(
+                loop.run_in_executor(pool, _run_inspection, inspect, db_path, fetch_batch)
+                for inspect in inspectors
+            ))
         
-        if result is False:
-            db_file = db_path or "storybook.db"
-            raise DatabaseError(f"Database file not found or no image data available", 
-                             db_path=db_file,
-                             severity=ErrorSeverity.ERROR)
-            return False
-                             
-        logger.info("Image check completed.")
+        sys.stdout.write("".join(reports))
+        sys.stdout.flush()
+        _log_done("Parallel database inspection completed.", "inspect_all_parallel", db_path, t0)
         return True
-    except ImportError:
-        raise DatabaseError("Failed to import content_inspection module", 
-                          severity=ErrorSeverity.ERROR)
-        return False
+    except DatabaseError:
+        # Already logged when it was constructed
+        raise
     except Exception as e:
-        raise DatabaseError("Failed to check image information", 
-                          db_path=db_path,
-                          severity=ErrorSeverity.ERROR, 
-                          details=str(e))
-        return False 
\ No newline at end of file
+        raise _db_err(_MSG_PARALLEL_FAIL, "DATABASE-INSPECT-FAILURE-002",
+                      "inspect_all_parallel", e, db_path=db_path, exc=e) from e
+
+if _dbi is None or _ci is None:
+    _inspection_import_error = _dbi_import_error or _ci_import_error
+    inspect_all = _unavailable_cmd(
+        "inspect_all", "INSPECT", "inspection", _inspection_import_error, inspect_all.__doc__
+    )
+    inspect_all_parallel = _unavailable_cmd(
+        "inspect_all_parallel", "INSPECT", "inspection", _inspection_import_error,
+        inspect_all_parallel.__doc__
+    )
@@ -5,7 +5,6 @@ Content inspection utilities for examining character and image data
 import os
 import sys
 import json
-import sqlite3
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import logging
@@ -18,6 +17,7 @@ from app.core.errors.management import (
 from app.core.logging import setup_logger
 
 from .db_utils import DEFAULT_DB_PATH
+from .db_inspection import BATCH_SIZE, buffered_output, inspection_conn, iter_rows
 
 # Setup logger
 logger = setup_logger(
@@ -26,180 +26,255 @@ logger = setup_logger(
     log_file="logs/management.log"
 )
 
-def print_line(char="-", length=80):
-    """Print a separator line with the specified character and length"""
-    print(char * length)
-    sys.stdout.flush()
+# Records shown per table, and image paths checked on disk
+SAMPLE_ROWS = 5
+IMAGE_PATH_ROWS = 10
+
+# One parameterised statement for every table, so it is prepared once per connection
+TABLE_COLUMNS_SQL = "SELECT name, type FROM pragma_table_info(?) ORDER BY cid"
+
+def print_line(char="-", length=80, out=None):
+    """Print a separator line with the specified character and length
+    
+    Written straight to the target stream; the CLI runs with stdout
+    line-buffered, so no explicit flush is needed.
+    """
+    (out or sys.stdout).write(char * length + "\n")
 
 @with_error_handling
-def check_characters(db_path=None):
+def check_characters(db_path=None, conn=None, out=None, fetch_batch=BATCH_SIZE):
     """Check and display character information from the database
     
     Args:
         db_path: Optional custom path for the database file
+        conn: Optional open connection to reuse; it is left open
+        out: Optional text stream for the report (defaults to sys.stdout)
+        fetch_batch: Rows fetched per round trip when walking results
     """
-    print("DEBUG: Starting check_characters()...")
-    sys.stdout.flush()
-    
-    if db_path is None:
-        db_path = DEFAULT_DB_PATH
-        print(f"DEBUG: Using default DB path: {db_path}")
-        sys.stdout.flush()
-    
-    print("\nCHARACTER INSPECTION")
-    print_line("=")
-    print(f"Database path: {db_path}")
-    sys.stdout.flush()
-    
-    if not os.path.exists(db_path):
-        print(f"Error: Database file not found at {db_path}")
-        sys.stdout.flush()
-        raise DatabaseError("Database file not found", db_path=db_path, 
-                          severity=ErrorSeverity.ERROR)
-    
-    try:
-        # Connect to the database
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    with buffered_output(out) as out:
+        print("DEBUG: Starting check_characters()...", file=out)
         
-        # Check character table structure
-        print_line()
-        print("CHARACTERS TABLE STRUCTURE:")
-        cursor.execute("PRAGMA table_info(characters)")
-        columns = cursor.fetchall()
-        for col in columns:
-            print(f"  {col['name']} ({col['type']})")
-        sys.stdout.flush()
+        if db_path is None:
+            db_path = DEFAULT_DB_PATH
+            print(f"DEBUG: Using default DB path: {db_path}", file=out)
         
-        # Count characters
-        print_line()
-        cursor.execute("SELECT COUNT(*) FROM characters")
-        count = cursor.fetchone()[0]
-        print(f"TOTAL CHARACTERS: {count}")
-        sys.stdout.flush()
+        print("\nCHARACTER INSPECTION", file=out)
+        print_line("=", out=out)
+        print(f"Database path: {db_path}", file=out)
         
-        # Look at character records
-        if count > 0:
-            print_line()
-            print("CHARACTER RECORDS (showing up to 5):")
-            cursor.execute("""
-                SELECT id, story_id, name, description, image_url, created_at 
-                FROM characters LIMIT 5
-            """)
-            records = cursor.fetchall()
-            
-            for i, record in enumerate(records, 1):
-                print(f"\nCHARACTER {i}:")
-                print(f"  ID: {record['id']}")
-                print(f"  Story ID: {record['story_id']}")
-                print(f"  Name: {record['name']}")
-                print(f"  Description: {record['description']}")
-                print(f"  Image URL: {record['image_url']}")
-                print(f"  Created At: {record['created_at']}")
-                sys.stdout.flush()
+        if not os.path.exists(db_path):
+            print(f"Error: Database file not found at {db_path}", file=out)
+            raise DatabaseError("Database file not found", db_path=db_path, 
+                              severity=ErrorSeverity.ERROR)
         
-        print_line("=")
-        print("Character inspection completed.")
-        sys.stdout.flush()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Error checking characters: {str(e)}")
-        sys.stdout.flush()
-        raise DatabaseError("Failed to check character information", 
-                          db_path=db_path,
-                          severity=ErrorSeverity.ERROR, 
-                          details=str(e))
+        try:
+            # Borrow a pooled connection unless the caller passed one in
+            with inspection_conn(db_path, conn) as conn:
+                # Rows are plain tuples, unpacked by position below
+                cursor = conn.cursor()
+                
+                # Check character table structure
+                print_line(out=out)
+                print("CHARACTERS TABLE STRUCTURE:", file=out)
+                cursor.execute(TABLE_COLUMNS_SQL, ("characters",))
+                for name, col_type in iter_rows(cursor, fetch_batch):
+                    print(f"  {name} ({col_type})", file=out)
+                
+                # Count characters and fetch the sample in one statement
+                records = cursor.execute("""
+                    SELECT id, story_id, name, description, image_url, created_at,
+                           (SELECT COUNT(*) FROM characters) AS total
+                    FROM characters LIMIT ?
+                """, (SAMPLE_ROWS,)).fetchall()
+                count = records[0][-1] if records else 0
+                print_line(out=out)
+                print(f"TOTAL CHARACTERS: {count}", file=out)
+                
+                # Look at character records
+                if count > 0:
+                    print_line(out=out)
+                    print(f"CHARACTER RECORDS (showing up to {SAMPLE_ROWS}):", file=out)
+                    
+                    for i, (char_id, story_id, name, description, image_url, created_at, _) in enumerate(records, 1):
+                        print(f"\nCHARACTER {i}:", file=out)
+                        print(f"  ID: {char_id}", file=out)
+                        print(f"  Story ID: {story_id}", file=out)
+                        print(f"  Name: {name}", file=out)
+                        print(f"  Description: {description}", file=out)
+                        print(f"  Image URL: {image_url}", file=out)
+                        print(f"  Created At: {created_at}", file=out)
+                
+                print_line("=", out=out)
+                print("Character inspection completed.", file=out)
+                return True
+        except Exception as e:
+            print(f"Error checking characters: {str(e)}", file=out)
+            raise DatabaseError("Failed to check character information", 
+                              db_path=db_path,
+                              severity=ErrorSeverity.ERROR, 
+                              details=str(e))
 
 @with_error_handling
-def check_images(db_path=None):
+def check_images(db_path=None, conn=None, out=None, fetch_batch=BATCH_SIZE):
     """Check and display image information from the database
     
     Args:
         db_path: Optional custom path for the database file
+        conn: Optional open connection to reuse; it is left open
+        out: Optional text stream for the report (defaults to sys.stdout)
+        fetch_batch: Rows fetched per round trip when walking results
     """
-    if db_path is None:
-        db_path = DEFAULT_DB_PATH
-    
-    print("\nIMAGE INSPECTION")
-    print_line("=")
-    print(f"Database path: {db_path}")
-    sys.stdout.flush()
-    
-    if not os.path.exists(db_path):
-        print(f"Error: Database file not found at {db_path}")
-        sys.stdout.flush()
-        raise DatabaseError("Database file not found", db_path=db_path, 
-                          severity=ErrorSeverity.ERROR)
-    
-    try:
-        # Connect to the database
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+    with buffered_output(out) as out:
+        if db_path is None:
+            db_path = DEFAULT_DB_PATH
+        
+        print("\nIMAGE INSPECTION", file=out)
+        print_line("=", out=out)
+        print(f"Database path: {db_path}", file=out)
         
-        # Check images table structure
-        print_line()
-        print("IMAGES TABLE STRUCTURE:")
-        cursor.execute("PRAGMA table_info(images)")
-        columns = cursor.fetchall()
-        for col in columns:
-            print(f"  {col['name']} ({col['type']})")
-        sys.stdout.flush()
+        if not os.path.exists(db_path):
+            print(f"Error: Database file not found at {db_path}", file=out)
+            raise DatabaseError("Database file not found", db_path=db_path, 
+                              severity=ErrorSeverity.ERROR)
         
-        # Count images
-        print_line()
-        cursor.execute("SELECT COUNT(*) FROM images")
-        count = cursor.fetchone()[0]
-        print(f"TOTAL IMAGES: {count}")
-        sys.stdout.flush()
+        try:
+            # Borrow a pooled connection unless the caller passed one in
+            with inspection_conn(db_path, conn) as conn:
+                # Rows are plain tuples, unpacked by position below
+                cursor = conn.cursor()
+                
+                # Check images table structure
+                print_line(out=out)
+                print("IMAGES TABLE STRUCTURE:", file=out)
+                cursor.execute(TABLE_COLUMNS_SQL, ("images",))
+                for name, col_type in iter_rows(cursor, fetch_batch):
+                    print(f"  {name} ({col_type})", file=out)
+                
+                # Count images and fetch the sample, including the paths to check, at once
+                records = cursor.execute("""
+                    SELECT id, user_id, filename, path, type, width, height, created_at,
+                           (SELECT COUNT(*) FROM images) AS total
+                    FROM images LIMIT ?
+                """, (max(SAMPLE_ROWS, IMAGE_PATH_ROWS),)).fetchall()
+                count = records[0][-1] if records else 0
+                print_line(out=out)
+                print(f"TOTAL IMAGES: {count}", file=out)
+                
+                # Look at image records
+                if count > 0:
+                    print_line(out=out)
+                    print(f"IMAGE RECORDS (showing up to {SAMPLE_ROWS}):", file=out)
+                    
+                    for i, record in enumerate(records[:SAMPLE_ROWS], 1):
+                        image_id, user_id, filename, path, image_type, width, height, created_at, _ = record
+                        print(f"\nIMAGE {i}:", file=out)
+                        print(f"  ID: {image_id}", file=out)
+                        print(f"  User ID: {user_id}", file=out)
+                        print(f"  Filename: {filename}", file=out)
+                        print(f"  Path: {path}", file=out)
+                        print(f"  Type: {image_type}", file=out)
+                        print(f"  Dimensions: {width}x{height}", file=out)
+                        print(f"  Created At: {created_at}", file=out)
+                
+                # Check for image files existence
+                if count > 0:
+                    print_line(out=out)
+                    print("CHECKING IMAGE FILES EXISTENCE:", file=out)
+                    
+                    for record in records[:IMAGE_PATH_ROWS]:
+                        path = record[3]
+                        if path and os.path.exists(path):
+                            print(f"  ✅ File exists: {path}", file=out)
+                        else:
+                            print(f"  ❌ File missing: {path}", file=out)
+                
+                print_line("=", out=out)
+                print("Image inspection completed.", file=out)
+                return True
+        except Exception as e:
+            print(f"Error checking images: {str(e)}", file=out)
+            raise DatabaseError("Failed to check image information", 
+                              db_path=db_path,
+                              severity=ErrorSeverity.ERROR, 
+                              details=str(e))
+
+@with_error_handling
+def check_all(db_path=None, conn=None, out=None, fetch_batch=BATCH_SIZE):
+    """Summarise characters and images per story in a single query
+    
+    Characters hang off stories directly; images belong to users, so each
+    story is matched to its owner's images. Both tables are aggregated once
+    and joined to stories, rather than scanned again by separate checks.
+    
+    Args:
+        db_path: Optional custom path for the database file
+        conn: Optional open connection to reuse; it is left open
+        out: Optional text stream for the report (defaults to sys.stdout)
+        fetch_batch: Rows fetched per round trip when walking results
+    """
+    with buffered_output(out) as out:
+        if db_path is None:
+            db_path = DEFAULT_DB_PATH
         
-        # Look at image records
-        if count > 0:
-            print_line()
-            print("IMAGE RECORDS (showing up to 5):")
-            cursor.execute("""
-                SELECT id, user_id, filename, path, type, width, height, created_at
-                FROM images LIMIT 5
-            """)
-            records = cursor.fetchall()
-            
-            for i, record in enumerate(records, 1):
-                print(f"\nIMAGE {i}:")
-                print(f"  ID: {record['id']}")
-                print(f"  User ID: {record['user_id']}")
-                print(f"  Filename: {record['filename']}")
-                print(f"  Path: {record['path']}")
-                print(f"  Type: {record['type']}")
-                print(f"  Dimensions: {record['width']}x{record['height']}")
-                print(f"  Created At: {record['created_at']}")
-                sys.stdout.flush()
+        print("\nCONTENT INSPECTION", file=out)
+        print_line("=", out=out)
+        print(f"Database path: {db_path}", file=out)
         
-        # Check for image files existence
-        if count > 0:
-            print_line()
-            print("CHECKING IMAGE FILES EXISTENCE:")
-            cursor.execute("SELECT path FROM images LIMIT 10")
-            paths = cursor.fetchall()
-            
-            for path_data in paths:
-                path = path_data['path']
-                if path and os.path.exists(path):
-                    print(f"  ✅ File exists: {path}")
-                else:
-                    print(f"  ❌ File missing: {path}")
-            sys.stdout.flush()
+        if not os.path.exists(db_path):
+            print(f"Error: Database file not found at {db_path}", file=out)
+            raise DatabaseError("Database file not found", db_path=db_path, 
+                              severity=ErrorSeverity.ERROR)
         
-        print_line("=")
-        print("Image inspection completed.")
-        sys.stdout.flush()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Error checking images: {str(e)}")
-        sys.stdout.flush()
-        raise DatabaseError("Failed to check image information", 
-                          db_path=db_path,
-                          severity=ErrorSeverity.ERROR, 
-                          details=str(e)) 
\ No newline at end of file
+        try:
+            # Borrow a pooled connection unless the caller passed one in
+            with inspection_conn(db_path, conn) as conn:
+                # Rows are plain tuples, unpacked by position below
+                cursor = conn.execute("""
+                    SELECT s.id, s.user_id, s.title,
+                           COALESCE(c.total, 0) AS characters,
+                           COALESCE(i.total, 0) AS images
+                    FROM stories s
+                    LEFT JOIN (
+                        SELECT story_id, COUNT(*) AS total FROM characters GROUP BY story_id
+                    ) c ON c.story_id = s.id
+                    LEFT JOIN (
+                        SELECT user_id, COUNT(*) AS total FROM images GROUP BY user_id
+                    ) i ON i.user_id = s.user_id
+                    ORDER BY s.id
+                """)
+                
+                print_line(out=out)
+                print("CONTENT PER STORY:", file=out)
+                stories = 0
+                characters = 0
+                without_characters = 0
+                image_owners = {}
+                for story_id, user_id, title, story_chars, owner_images in iter_rows(cursor, fetch_batch):
+                    stories += 1
+                    characters += story_chars
+                    if not story_chars:
+                        without_characters += 1
+                    image_owners[user_id] = owner_images
+                    print(f"  Story {story_id} ({title}): "
+                          f"{story_chars} characters, "
+                          f"{owner_images} images owned by user {user_id}", file=out)
+                
+                print_line(out=out)
+                print(f"TOTAL STORIES: {stories}", file=out)
+                print(f"TOTAL CHARACTERS IN STORIES: {characters}", file=out)
+                print(f"STORIES WITHOUT CHARACTERS: {without_characters}", file=out)
+                print(f"IMAGES OWNED BY STORY AUTHORS: {sum(image_owners.values())}", file=out)
+                
+                print_line("=", out=out)
+                print("Content inspection completed.", file=out)
+                return True
+        except Exception as e:
+            print(f"Error checking content: {str(e)}", file=out)
+            raise DatabaseError(f"Failed to check content information: {e}", 
+                              db_path=db_path,
+                              severity=ErrorSeverity.ERROR,
+                              context=ErrorContext(
+                                  source="management.content_inspection.check_all",
+                                  severity=ErrorSeverity.ERROR,
+                                  additional_data={"error": str(e)}
+                              )) from e
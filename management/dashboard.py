@@ -3,21 +3,39 @@ Simple web dashboard for managing development servers.
 """
 import os
 import sys
+import asyncio
 import subprocess
 import threading
 import time
 import logging
 import json
-from pathlib import Path
+import re
+import gzip
+import platform
+import datetime
 
 try:
-    from flask import Flask, render_template_string, jsonify, request
+    from flask import Flask, Response, jsonify, request
     flask_available = True
 except ImportError:
     flask_available = False
 
-from .pid_utils import get_pid, is_process_running
+# Serve with waitress's thread pool when installed; otherwise Werkzeug's threaded server
+try:
+    from waitress import serve as _wsgi_serve
+except ImportError:
+    _wsgi_serve = None
+
+# Worker threads for concurrent dashboard requests
+DASHBOARD_THREADS = 8
+
+# Responses smaller than this are sent uncompressed
+GZIP_MIN_SIZE = 500
+
+from .pid_utils import get_pid, is_process_running, save_pid
 from .commands import remove_pid_file
+from .process_utils import spawn, frontend_dir, resolve_exe, which
+from .commands import stop_server as _cmd_stop_server
 from app.core.logging import setup_logger
 
 # Setup logger
@@ -27,6 +45,121 @@ logger = setup_logger(
     log_file="logs/management.log"
 )
 
+# Stylesheet for the dashboard, served separately so browsers can cache it
+DASHBOARD_CSS = """
+body {
+    font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+    line-height: 1.5;
+    margin: 0;
+    padding: 0;
+    color: #333;
+    background: #f5f5f5;
+}
+.container {
+    max-width: 1000px;
+    margin: 0 auto;
+    padding: 1rem;
+}
+.header {
+    background: #4a90e2;
+    color: white;
+    padding: 1rem;
+    margin-bottom: 1rem;
+}
+.header h1 {
+    margin: 0;
+    font-size: 1.5rem;
+}
+.card {
+    background: white;
+    border-radius: 4px;
+    box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+    margin-bottom: 1rem;
+    overflow: hidden;
+}
+.card-header {
+    padding: 1rem;
+    background: #f9f9f9;
+    border-bottom: 1px solid #eee;
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+}
+.card-header h2 {
+    margin: 0;
+    font-size: 1.2rem;
+}
+.card-body {
+    padding: 1rem;
+}
+.grid {
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
+    gap: 1rem;
+}
+.status {
+    display: inline-block;
+    padding: 0.25rem 0.5rem;
+    border-radius: 4px;
+    font-size: 0.875rem;
+    font-weight: 500;
+}
+.status-running {
+    background: #48c774;
+    color: white;
+}
+.status-stopped {
+    background: #e25c4a;
+    color: white;
+}
+.button {
+    display: inline-block;
+    background: #4a90e2;
+    color: white;
+    border: none;
+    padding: 0.5rem 1rem;
+    border-radius: 4px;
+    font-size: 0.875rem;
+    cursor: pointer;
+    text-decoration: none;
+}
+.button:hover {
+    background: #3a80d2;
+}
+.button-danger {
+    background: #e25c4a;
+}
+.button-danger:hover {
+    background: #d24c3a;
+}
+.button-group {
+    display: flex;
+    gap: 0.5rem;
+}
+table {
+    width: 100%;
+    border-collapse: collapse;
+}
+table th, table td {
+    text-align: left;
+    padding: 0.5rem;
+    border-bottom: 1px solid #eee;
+}
+table th {
+    font-weight: 500;
+    color: #666;
+}
+.refresh {
+    font-size: 0.875rem;
+    color: #666;
+    text-align: center;
+    margin-top: 1rem;
+}
+"""
+
+# Whitespace collapsed once at import; the stylesheet never changes at runtime
+_DASH_CSS = re.sub(r"\s+", " ", DASHBOARD_CSS).strip()
+
 # HTML template for the dashboard
 DASHBOARD_HTML = """
 <!DOCTYPE html>
@@ -35,116 +168,7 @@ DASHBOARD_HTML = """
     <title>Dev Server Dashboard</title>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-            line-height: 1.5;
-            margin: 0;
-            padding: 0;
-            color: #333;
-            background: #f5f5f5;
-        }
-        .container {
-            max-width: 1000px;
-            margin: 0 auto;
-            padding: 1rem;
-        }
-        .header {
-            background: #4a90e2;
-            color: white;
-            padding: 1rem;
-            margin-bottom: 1rem;
-        }
-        .header h1 {
-            margin: 0;
-            font-size: 1.5rem;
-        }
-        .card {
-            background: white;
-            border-radius: 4px;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            margin-bottom: 1rem;
-            overflow: hidden;
-        }
-        .card-header {
-            padding: 1rem;
-            background: #f9f9f9;
-            border-bottom: 1px solid #eee;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        .card-header h2 {
-            margin: 0;
-            font-size: 1.2rem;
-        }
-        .card-body {
-            padding: 1rem;
-        }
-        .grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 1rem;
-        }
-        .status {
-            display: inline-block;
-            padding: 0.25rem 0.5rem;
-            border-radius: 4px;
-            font-size: 0.875rem;
-            font-weight: 500;
-        }
-        .status-running {
-            background: #48c774;
-            color: white;
-        }
-        .status-stopped {
-            background: #e25c4a;
-            color: white;
-        }
-        .button {
-            display: inline-block;
-            background: #4a90e2;
-            color: white;
-            border: none;
-            padding: 0.5rem 1rem;
-            border-radius: 4px;
-            font-size: 0.875rem;
-            cursor: pointer;
-            text-decoration: none;
-        }
-        .button:hover {
-            background: #3a80d2;
-        }
-        .button-danger {
-            background: #e25c4a;
-        }
-        .button-danger:hover {
-            background: #d24c3a;
-        }
-        .button-group {
-            display: flex;
-            gap: 0.5rem;
-        }
-        table {
-            width: 100%;
-            border-collapse: collapse;
-        }
-        table th, table td {
-            text-align: left;
-            padding: 0.5rem;
-            border-bottom: 1px solid #eee;
-        }
-        table th {
-            font-weight: 500;
-            color: #666;
-        }
-        .refresh {
-            font-size: 0.875rem;
-            color: #666;
-            text-align: center;
-            margin-top: 1rem;
-        }
-    </style>
+    <link rel="stylesheet" href="/dash.css">
 </head>
 <body>
     <div class="header">
@@ -172,15 +196,15 @@ DASHBOARD_HTML = """
                                 <th>Status</th>
                                 <td>
                                     {% if backend_running %}
-                                    <span class="status status-running">Running</span>
+                                    <span id="backend-status" class="status status-running">Running</span>
                                     {% else %}
-                                    <span class="status status-stopped">Stopped</span>
+                                    <span id="backend-status" class="status status-stopped">Stopped</span>
                                     {% endif %}
                                 </td>
                             </tr>
                             <tr>
                                 <th>PID</th>
-                                <td>{{ backend_pid or 'N/A' }}</td>
+                                <td id="backend-pid">{{ backend_pid or 'N/A' }}</td>
                             </tr>
                             <tr>
                                 <th>Port</th>
@@ -191,9 +215,9 @@ DASHBOARD_HTML = """
                                 <td>
                                     <div class="button-group">
                                         {% if not backend_running %}
-                                        <a href="/start/backend" class="button">Start</a>
+                                        <a id="backend-action" href="/start/backend" class="button">Start</a>
                                         {% else %}
-                                        <a href="/stop/backend" class="button button-danger">Stop</a>
+                                        <a id="backend-action" href="/stop/backend" class="button button-danger">Stop</a>
                                         {% endif %}
                                         <a href="http://localhost:{{ backend_port }}/api" target="_blank" class="button">Open API</a>
                                     </div>
@@ -209,15 +233,15 @@ DASHBOARD_HTML = """
                                 <th>Status</th>
                                 <td>
                                     {% if frontend_running %}
-                                    <span class="status status-running">Running</span>
+                                    <span id="frontend-status" class="status status-running">Running</span>
                                     {% else %}
-                                    <span class="status status-stopped">Stopped</span>
+                                    <span id="frontend-status" class="status status-stopped">Stopped</span>
                                     {% endif %}
                                 </td>
                             </tr>
                             <tr>
                                 <th>PID</th>
-                                <td>{{ frontend_pid or 'N/A' }}</td>
+                                <td id="frontend-pid">{{ frontend_pid or 'N/A' }}</td>
                             </tr>
                             <tr>
                                 <th>Port</th>
@@ -228,9 +252,9 @@ DASHBOARD_HTML = """
                                 <td>
                                     <div class="button-group">
                                         {% if not frontend_running %}
-                                        <a href="/start/frontend" class="button">Start</a>
+                                        <a id="frontend-action" href="/start/frontend" class="button">Start</a>
                                         {% else %}
-                                        <a href="/stop/frontend" class="button button-danger">Stop</a>
+                                        <a id="frontend-action" href="/stop/frontend" class="button button-danger">Stop</a>
                                         {% endif %}
                                         <a href="http://localhost:{{ frontend_port }}" target="_blank" class="button">Open App</a>
                                     </div>
@@ -300,40 +324,112 @@ DASHBOARD_HTML = """
             Last updated: {{ current_time }}
         </div>
     </div>
+    <script>
+        // Poll the JSON status endpoint and patch the page in place
+        function applyStatus(server, running, pid) {
+            const status = document.getElementById(server + '-status');
+            status.className = 'status ' + (running ? 'status-running' : 'status-stopped');
+            status.textContent = running ? 'Running' : 'Stopped';
+            document.getElementById(server + '-pid').textContent = pid || 'N/A';
+            const action = document.getElementById(server + '-action');
+            action.href = (running ? '/stop/' : '/start/') + server;
+            action.className = running ? 'button button-danger' : 'button';
+            action.textContent = running ? 'Stop' : 'Start';
+        }
+        setInterval(async () => {
+            try {
+                const s = await (await fetch('/api/status')).json();
+                applyStatus('backend', s.backend_running, s.backend_pid);
+                applyStatus('frontend', s.frontend_running, s.frontend_pid);
+            } catch (e) {
+                // Dashboard unreachable; keep the last known state
+            }
+        }, 3000);
+    </script>
 </body>
 </html>
 """
 
+# Seconds the slow-to-gather system details are reused between page loads
+SYSINFO_TTL = 5.0
+_sysinfo_cache = {"t": 0.0, "data": None}
+
+# Node.js version, looked up once per process since it needs a subprocess
+_NODE_VERSION = None
+
+def _node_version():
+    """Get the Node.js version, running 'node --version' at most once"""
+    global _NODE_VERSION
+    if _NODE_VERSION is None:
+        node = which("node")
+        try:
+            _NODE_VERSION = subprocess.run(
+                [node, "--version"], capture_output=True, text=True, timeout=2
+            ).stdout.strip() if node else "Not found"
+        except (subprocess.SubprocessError, OSError):
+            _NODE_VERSION = "Not found"
+    return _NODE_VERSION
+
 def get_system_info():
-    """Get system information for display"""
-    import platform
-    import datetime
+    """Get system information for display
+    
+    Everything except the current time is cached for SYSINFO_TTL seconds.
+    """
+    current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    now = time.monotonic()
+    if _sysinfo_cache["data"] is not None and now - _sysinfo_cache["t"] < SYSINFO_TTL:
+        return {**_sysinfo_cache["data"], "current_time": current_time}
     
     # Get Python version
     python_version = sys.version.split()[0]
     
     # Get Node.js version
-    try:
-        node_version = subprocess.check_output(["node", "--version"], text=True).strip()
-    except (subprocess.SubprocessError, FileNotFoundError):
-        node_version = "Not found"
+    node_version = _node_version()
     
     # Get OS info
     os_info = platform.platform()
     
-    # Current time
-    current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
     # Project directory
     project_dir = os.getcwd()
     
-    return {
+    _sysinfo_cache["data"] = {
         "python_version": python_version,
         "node_version": node_version,
         "os_info": os_info,
-        "current_time": current_time,
         "project_dir": project_dir
     }
+    _sysinfo_cache["t"] = now
+    return {**_sysinfo_cache["data"], "current_time": current_time}
+
+def _server_status():
+    """PID and liveness of the backend and frontend servers"""
+    status = {}
+    for server in ("backend", "frontend"):
+        pid = get_pid(server)
+        status[f"{server}_pid"] = pid
+        status[f"{server}_running"] = pid is not None and is_process_running(pid)
+    return status
+
+# Servers started from this dashboard, kept so they can be stopped and reaped
+# directly; request handlers run on several server threads, so access is locked
+_PROCESSES = {}
+_PROCESSES_LOCK = threading.Lock()
+
+def _stop(server):
+    """Stop a server, using the process handle when this dashboard started it"""
+    with _PROCESSES_LOCK:
+        process = _PROCESSES.pop(server, None)
+    if process is not None and process.poll() is None:
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        remove_pid_file(server)
+        logger.info(f"Stopped {server} server (PID: {process.pid})")
+    elif get_pid(server):
+        asyncio.run(_cmd_stop_server(server))
 
 def create_dashboard_app(backend_port=8080, frontend_port=3000, dashboard_port=3001):
     """Create the Flask dashboard app without starting it"""
@@ -343,28 +439,19 @@ def create_dashboard_app(backend_port=8080, frontend_port=3000, dashboard_port=3
         return None
     
     app = Flask(__name__)
+    # render_template_string compiles its source on every call; compile once here
+    # through the app's environment so autoescaping and globals are unchanged
+    dashboard_template = app.jinja_env.from_string(DASHBOARD_HTML)
     
     @app.route('/')
     def home():
         """Dashboard home page"""
-        # Get server status
-        backend_pid = get_pid("backend")
-        frontend_pid = get_pid("frontend")
-        dashboard_pid = get_pid("dashboard")
-        
-        backend_running = backend_pid is not None and is_process_running(backend_pid)
-        frontend_running = frontend_pid is not None and is_process_running(frontend_pid)
-        
         # Get system info
         system_info = get_system_info()
         
         # Render template
-        return render_template_string(
-            DASHBOARD_HTML, 
-            backend_running=backend_running,
-            frontend_running=frontend_running,
-            backend_pid=backend_pid,
-            frontend_pid=frontend_pid,
+        return dashboard_template.render(
+            **_server_status(),
             dashboard_pid=os.getpid(),  # Current process ID
             backend_port=backend_port,
             frontend_port=frontend_port,
@@ -372,16 +459,48 @@ def create_dashboard_app(backend_port=8080, frontend_port=3000, dashboard_port=3
             **system_info
         )
     
+    @app.after_request
+    def compress(response):
+        """Gzip text responses for clients that accept it"""
+        # The markup is repetitive, so the fastest level already shrinks it several-fold
+        if (response.status_code == 200
+                and not response.direct_passthrough
+                and response.mimetype in ('text/html', 'text/css')
+                and 'Content-Encoding' not in response.headers
+                and 'gzip' in request.headers.get('Accept-Encoding', '')):
+            body = response.get_data()
+            if len(body) >= GZIP_MIN_SIZE:
+                response.set_data(gzip.compress(body, compresslevel=1))
+                response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+    
     # Add all the other routes
     add_routes(app, backend_port, frontend_port)
     
+    # Look Node.js up now rather than on the first page load
+    _node_version()
+    
     return app
 
 def add_routes(app, backend_port, frontend_port):
     """Add all routes to the Flask app"""
+    @app.route('/api/status')
+    def status():
+        """Server status for the page's poller, without rendering HTML"""
+        return jsonify({**_server_status(), "dashboard_pid": os.getpid()})
+    
+    @app.route('/dash.css')
+    def stylesheet():
+        """Dashboard stylesheet"""
+        return Response(_DASH_CSS, mimetype='text/css',
+                        headers={'Cache-Control': 'public, max-age=86400'})
+    
     @app.route('/start/<server>')
     def start_server(server):
         """Start a server"""
+        # Servers outlive the dashboard and are never read from, so their
+        # output is discarded rather than left to fill an unread pipe
         if server == "backend":
             # Start backend server
             cmd = [
@@ -393,44 +512,29 @@ def add_routes(app, backend_port, frontend_port):
             ]
             
             # Start the process
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True
-            )
+            process = spawn(cmd, detach=True, cwd=os.getcwd())
             
             # Save PID
-            from .pid_utils import save_pid
             save_pid("backend", process.pid)
+            with _PROCESSES_LOCK:
+                _PROCESSES["backend"] = process
             
             logger.info(f"Started backend server (PID: {process.pid})")
         
         elif server == "frontend":
-            # Start frontend server
-            frontend_dir = Path("frontend").resolve()
-            if not frontend_dir.exists():
+            # Start frontend server; cwd= changes directory in the child only
+            frontend_path = frontend_dir()
+            if frontend_path is None:
                 return "Frontend directory not found", 404
             
-            # Change to frontend directory
-            original_dir = os.getcwd()
-            os.chdir(frontend_dir)
-            
             # Start the process
-            cmd = ["npm", "run", "dev"]
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True
-            )
+            cmd = [resolve_exe("npm"), "run", "dev"]
+            process = spawn(cmd, detach=True, cwd=frontend_path)
             
             # Save PID
-            from .pid_utils import save_pid
             save_pid("frontend", process.pid)
-            
-            # Return to original directory
-            os.chdir(original_dir)
+            with _PROCESSES_LOCK:
+                _PROCESSES["frontend"] = process
             
             logger.info(f"Started frontend server (PID: {process.pid})")
         
@@ -439,8 +543,7 @@ def add_routes(app, backend_port, frontend_port):
     @app.route('/stop/<server>')
     def stop_server(server):
         """Stop a server"""
-        from .commands import stop_server as cmd_stop_server
-        cmd_stop_server(server)
+        _stop(server)
         return {"status": "stopped"}, 302, {"Location": "/"}
     
     @app.route('/start-all')
@@ -457,13 +560,11 @@ def add_routes(app, backend_port, frontend_port):
     @app.route('/stop-all')
     def stop_all():
         """Stop all servers"""
-        from .commands import stop_server as cmd_stop_server
-        
         # Stop backend
-        cmd_stop_server("backend")
+        _stop("backend")
         
         # Stop frontend
-        cmd_stop_server("frontend")
+        _stop("frontend")
         
         return {"status": "stopped"}, 302, {"Location": "/"}
     
@@ -483,7 +584,6 @@ def start_dashboard(port=3001, backend_port=8080, frontend_port=3000):
     logger.info("For color-coded dashboard logs, run the dashboard separately")
     
     # Save the dashboard PID
-    from .pid_utils import save_pid
     save_pid("dashboard", os.getpid())
     
     # Create and run the app
@@ -492,7 +592,10 @@ def start_dashboard(port=3001, backend_port=8080, frontend_port=3000):
         logger.info(f"Starting dashboard on http://localhost:{port}")
         logger.info("Press Ctrl+C to stop")
         try:
-            app.run(host='0.0.0.0', port=port, debug=True)
+            if _wsgi_serve is not None:
+                _wsgi_serve(app, host='0.0.0.0', port=port, threads=DASHBOARD_THREADS, _quiet=True)
+            else:
+                app.run(host='0.0.0.0', port=port, threaded=True)
         finally:
             # Clean up PID file when stopping
             remove_pid_file("dashboard") 
\ No newline at end of file
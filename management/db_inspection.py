@@ -2,11 +2,14 @@
 Database inspection utilities for examining and reporting on database structure and contents
 """
 
+import io
 import os
 import sys
 import json
 import sqlite3
 import datetime
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 import logging
@@ -27,235 +30,419 @@ logger = setup_logger(
     log_file="logs/management.log"
 )
 
-def print_line(char="-", length=60):
-    """Print a separator line with the specified character and length"""
-    print(char * length)
-    sys.stdout.flush()
+# Upper bound for memory-mapped reads; SQLite never maps past the file end
+INSPECTION_MMAP_SIZE = 1 << 30
 
-def check_db_structure(db_path=None):
-    """Check and display the structure of the database
+# Rows pulled per fetchmany() call when walking query results
+BATCH_SIZE = 1024
+
+# Idle read-only connections kept per resolved database path, each stored
+# with the identity of the file it was opened on
+CONN_POOL_SIZE = 4
+_CONN_POOL: Dict[str, deque] = {}
+
+# Table listing, columns and row counts per resolved database path and file
+# identity, reused while PRAGMA schema_version and the files' stat stamp are
+# unchanged
+_STRUCTURE_CACHE: Dict[tuple, tuple] = {}
+
+def _configure_read_conn(conn):
+    """Apply read-only inspection PRAGMAs to a connection"""
+    conn.execute(f"PRAGMA mmap_size={INSPECTION_MMAP_SIZE}")
+    conn.execute("PRAGMA cache_size=-8000")
+    # Sorts and GROUP BY spill to memory rather than temp files
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA query_only=1")
+    return conn
+
+def connect_read_only(db_path, check_same_thread=True):
+    """Open a read-only connection tuned for inspection queries
     
     Args:
-        db_path: Optional custom path for the database file
+        db_path: Path to an existing database file
+        check_same_thread: Passed through to sqlite3.connect
         
     Returns:
-        True if successful, False otherwise
+        sqlite3.Connection that cannot modify or create the database
+    """
+    conn = sqlite3.connect(
+        f"{Path(db_path).resolve().as_uri()}?mode=ro",
+        uri=True,
+        check_same_thread=check_same_thread
+    )
+    return _configure_read_conn(conn)
+
+def _file_identity(db_path):
+    """Device, inode and mtime of a database file
+    
+    A file deleted and recreated at the same path differs in at least one
+    of these, even when the filesystem reuses the inode number.
+    """
+    st = os.stat(db_path)
+    return (st.st_dev, st.st_ino, st.st_mtime_ns)
+
+@contextmanager
+def borrow_conn(db_path):
+    """Borrow a pooled read-only connection for a database
+    
+    Connections are kept per resolved path so repeated inspections reuse
+    the applied PRAGMAs and a warm page cache. A pooled connection opened
+    on a file that has since been replaced is closed rather than reused.
+    The block runs inside one read transaction, so SQLite takes its shared
+    lock once and every query sees the same snapshot. A connection is
+    returned to the pool only if the block exits cleanly; otherwise it is
+    closed.
+    
+    Args:
+        db_path: Path to an existing database file
         
-    Raises:
-        FileNotFoundError: If the database file doesn't exist
+    Yields:
+        sqlite3.Connection usable from any thread, one borrower at a time
     """
-    print("=== DEBUG: Running check_db_structure() ===")
-    sys.stdout.flush()
+    key = str(Path(db_path).resolve())
+    # deque append/pop are atomic under the GIL, so no lock is taken per borrow
+    pool = _CONN_POOL.setdefault(key, deque())
+    identity = _file_identity(key)
+    conn = None
+    while conn is None:
+        try:
+            conn_identity, conn = pool.pop()
+        except IndexError:
+            conn = connect_read_only(key, check_same_thread=False)
+            break
+        if conn_identity != identity:
+            conn.close()
+            conn = None
     
-    if db_path is None:
-        db_path = DEFAULT_DB_PATH
+    try:
+        conn.execute("BEGIN")
+        yield conn
+    except BaseException:
+        conn.close()
+        raise
+    conn.commit()
     
-    print("\nDATABASE STRUCTURE CHECK")
-    print_line("=")
-    print(f"Database path: {db_path}")
-    sys.stdout.flush()
+    if len(pool) < CONN_POOL_SIZE:
+        pool.append((identity, conn))
+    else:
+        conn.close()
+
+@contextmanager
+def inspection_conn(db_path, conn=None):
+    """Yield the caller's connection, or a pooled one for the duration"""
+    if conn is not None:
+        yield conn
+        return
+    with borrow_conn(db_path) as conn:
+        yield conn
+
+def iter_rows(cursor, fetch_batch=BATCH_SIZE):
+    """Yield the rows of an executed cursor, fetching them in batches"""
+    while rows := cursor.fetchmany(fetch_batch):
+        yield from rows
+
+def _quote(name):
+    """Quote an identifier for interpolation into SQL"""
+    return '"' + name.replace('"', '""') + '"'
+
+def _table_columns(cursor, fetch_batch=BATCH_SIZE):
+    """Fetch every table's column info in one query, keyed by table name"""
+    cursor.execute("""
+        SELECT m.name, p.cid, p.name, p.type, p."notnull", p.dflt_value, p.pk
+        FROM sqlite_master m JOIN pragma_table_info(m.name) p
+        WHERE m.type = 'table'
+        ORDER BY m.name, p.cid
+    """)
+    columns = {}
+    for table_name, *col in iter_rows(cursor, fetch_batch):
+        columns.setdefault(table_name, []).append(tuple(col))
+    return columns
+
+def _table_counts(cursor, tables):
+    """Count the rows of every table in one UNION ALL query"""
+    if not tables:
+        return {}
+    cursor.execute(" UNION ALL ".join(
+        f"SELECT ?, COUNT(*) FROM {_quote(name)}" for name in tables
+    ), tables)
+    return {name: count for name, count in cursor}
+
+def _file_stamp(db_path):
+    """Size and mtime of the database and its WAL, which move on every commit"""
+    stamp = []
+    for path in (db_path, f"{db_path}-wal"):
+        try:
+            st = os.stat(path)
+            stamp.append((st.st_size, st.st_mtime_ns))
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def _table_summary(cursor, db_path, fetch_batch=BATCH_SIZE):
+    """Return the tables, their columns and their row counts
     
-    if not os.path.exists(db_path):
-        print(f"\nERROR: Database file not found at {db_path}")
-        sys.stdout.flush()
-        raise FileNotFoundError(f"Database file not found at {db_path}")
+    Columns are re-read only when PRAGMA schema_version moves or the file
+    has been replaced or rewritten, and row counts only when the database
+    or its WAL has been written since the last call, so repeated
+    inspections cost a single PRAGMA and a stat.
+    
+    Returns:
+        (tables, columns, counts), tables in sqlite_master order
+    """
+    path = str(Path(db_path).resolve())
+    key = (path, _file_identity(path))
+    schema_version = cursor.execute("PRAGMA schema_version").fetchone()[0]
+    stamp = _file_stamp(path)
+    
+    cached = _STRUCTURE_CACHE.get(key)
+    if cached is not None and cached[0] == schema_version:
+        _, cached_stamp, tables, columns, counts = cached
+        if cached_stamp == stamp:
+            return tables, columns, counts
+    else:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        tables = [name for (name,) in cursor]
+        columns = _table_columns(cursor, fetch_batch)
     
+    counts = _table_counts(cursor, tables)
+    # Drop entries for earlier files at this path before caching this one
+    for stale in [k for k in _STRUCTURE_CACHE if k[0] == path and k != key]:
+        del _STRUCTURE_CACHE[stale]
+    _STRUCTURE_CACHE[key] = (schema_version, stamp, tables, columns, counts)
+    return tables, columns, counts
+
+@contextmanager
+def buffered_output(out=None):
+    """Collect a report in memory and hand it to the stream in one write
+    
+    The report is written even if the inspection fails part way, so the
+    partial output and error line still reach the user. A stream that is
+    already in memory, such as the dump report, is written to directly.
+    """
+    if isinstance(out, io.StringIO):
+        yield out
+        return
+    target = out or sys.stdout
+    buf = io.StringIO()
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        yield buf
+    finally:
+        target.write(buf.getvalue())
+        target.flush()
+
+def print_line(char="-", length=60, out=None):
+    """Print a separator line with the specified character and length
+    
+    Written straight to the target stream; the CLI runs with stdout
+    line-buffered, so no explicit flush is needed.
+    """
+    (out or sys.stdout).write(char * length + "\n")
+
+def check_db_structure(db_path=None, conn=None, out=None, fetch_batch=BATCH_SIZE):
+    """Check and display the structure of the database
+    
+    Args:
+        db_path: Optional custom path for the database file
+        conn: Optional open connection to reuse; it is left open
+        out: Optional text stream for the report (defaults to sys.stdout)
+        fetch_batch: Rows fetched per round trip when walking results
         
-        # Get list of tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-        tables = cursor.fetchall()
+    Returns:
+        True if successful, False otherwise
         
-        print(f"Tables found: {len(tables)}")
-        sys.stdout.flush()
+    Raises:
+        FileNotFoundError: If the database file doesn't exist
+    """
+    with buffered_output(out) as out:
+        print("=== DEBUG: Running check_db_structure() ===", file=out)
+        
+        if db_path is None:
+            db_path = DEFAULT_DB_PATH
         
-        # Process each table
-        for table_tuple in tables:
-            table_name = table_tuple[0]
-            print_line()
-            print(f"TABLE: {table_name}")
-            print_line()
-            sys.stdout.flush()
+        print("\nDATABASE STRUCTURE CHECK", file=out)
+        print_line("=", out=out)
+        print(f"Database path: {db_path}", file=out)
+        
+        if not os.path.exists(db_path):
+            print(f"\nERROR: Database file not found at {db_path}", file=out)
+            raise FileNotFoundError(f"Database file not found at {db_path}")
+        
+        own_conn = conn is None
+        try:
+            if own_conn:
+                conn = connect_read_only(db_path)
+            cursor = conn.cursor()
             
-            # Get table info
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
+            # Tables, columns and row counts, cached until the database changes
+            tables, columns, counts = _table_summary(cursor, db_path, fetch_batch)
+            tables = sorted(tables)
             
-            print("Columns:")
-            for col in columns:
-                col_id, name, type_name, notnull, default_val, pk = col
-                constraints = []
+            print(f"Tables found: {len(tables)}", file=out)
+            
+            # Process each table
+            for table_name in tables:
+                print_line(out=out)
+                print(f"TABLE: {table_name}", file=out)
+                print_line(out=out)
                 
-                if pk:
-                    constraints.append("PRIMARY KEY")
-                if notnull:
-                    constraints.append("NOT NULL")
-                if default_val is not None:
-                    constraints.append(f"DEFAULT {default_val}")
+                # Collect the column lines and hand them over in one write
+                lines = ["Columns:"]
+                for col in columns.get(table_name, ()):
+                    col_id, name, type_name, notnull, default_val, pk = col
+                    constraints = []
                     
-                constraints_str = " ".join(constraints)
-                formatted_line = f"  - {name}: {type_name}"
-                if constraints_str:
-                    formatted_line += f" ({constraints_str})"
-                print(formatted_line)
-            sys.stdout.flush()
+                    if pk:
+                        constraints.append("PRIMARY KEY")
+                    if notnull:
+                        constraints.append("NOT NULL")
+                    if default_val is not None:
+                        constraints.append(f"DEFAULT {default_val}")
+                        
+                    constraints_str = " ".join(constraints)
+                    formatted_line = f"  - {name}: {type_name}"
+                    if constraints_str:
+                        formatted_line += f" ({constraints_str})"
+                    lines.append(formatted_line)
+                out.write("\n".join(lines) + "\n")
+                
+                print(f"\nRow count: {counts[table_name]}", file=out)
             
-            # Row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()[0]
-            print(f"\nRow count: {count}")
-            sys.stdout.flush()
-        
-        print_line("=")
-        print("Database structure check completed.")
-        sys.stdout.flush()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Error checking database structure: {str(e)}")
-        sys.stdout.flush()
-        return False
+            print_line("=", out=out)
+            print("Database structure check completed.", file=out)
+            return True
+        except Exception as e:
+            print(f"Error checking database structure: {str(e)}", file=out)
+            return False
+        finally:
+            if own_conn and conn is not None:
+                conn.close()
 
 @with_error_handling
-def explore_db_contents(db_path=None):
+def explore_db_contents(db_path=None, conn=None, out=None, fetch_batch=BATCH_SIZE):
     """Explore and display the contents of the database
     
     Args:
         db_path: Optional custom path for the database file
+        conn: Optional open connection to reuse; it is left open
+        out: Optional text stream for the report (defaults to sys.stdout)
+        fetch_batch: Rows fetched per round trip when walking results
     """
-    print("=== DEBUG: Running explore_db_contents() ===")
-    sys.stdout.flush()
-    
-    if db_path is None:
-        db_path = DEFAULT_DB_PATH
-    
-    print("\nDATABASE CONTENTS EXPLORER")
-    print_line("=")
-    print(f"Database path: {db_path}")
-    sys.stdout.flush()
-    
-    if not os.path.exists(db_path):
-        print(f"Error: Database file not found at {db_path}")
-        sys.stdout.flush()
-        raise DatabaseError("Database file not found", db_path=db_path, 
-                          severity=ErrorSeverity.ERROR)
-    
-    try:
-        # Connect to the database
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row  # Enable column access by name
-        cursor = conn.cursor()
+    with buffered_output(out) as out:
+        print("=== DEBUG: Running explore_db_contents() ===", file=out)
         
-        # Get list of tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = cursor.fetchall()
+        if db_path is None:
+            db_path = DEFAULT_DB_PATH
         
-        print("\nTables in database:")
-        for table in tables:
-            table_name = table[0]
-            print(f"- {table_name}")
-            
-            # Get table schema
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
-            print(f"  Columns in {table_name}:")
-            for col in columns:
-                print(f"    {col[1]} ({col[2]})")
-            
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()[0]
-            print(f"  Row count: {count}")
-            sys.stdout.flush()
+        print("\nDATABASE CONTENTS EXPLORER", file=out)
+        print_line("=", out=out)
+        print(f"Database path: {db_path}", file=out)
         
-        # Check for images table
-        print("\n--- DETAILS FOR SPECIFIC TABLES ---")
-        try:
-            cursor.execute("SELECT COUNT(*) FROM images")
-            image_count = cursor.fetchone()[0]
-            print("\n=== IMAGES TABLE ===")
-            print(f"Total images: {image_count}")
-            sys.stdout.flush()
-            
-            if image_count > 0:
-                # Show image information (limit to 5)
-                try:
-                    cursor.execute("""
-                        SELECT id, user_id, filename, path, type, width, height, created_at
-                        FROM images LIMIT 5
-                    """)
-                    rows = cursor.fetchall()
-                    for row in rows:
-                        print(f"  Image ID: {row['id']}")
-                        print(f"  User ID: {row['user_id']}")
-                        print(f"  Filename: {row['filename']}")
-                        print(f"  Path: {row['path']}")
-                        print(f"  Type: {row['type']}")
-                        print(f"  Dimensions: {row['width']}x{row['height']}")
-                        print(f"  Created At: {row['created_at']}")
-                        print()
-                    sys.stdout.flush()
-                except sqlite3.OperationalError as e:
-                    print(f"  Error accessing image data: {str(e)}")
-                    sys.stdout.flush()
-        except sqlite3.OperationalError:
-            print("Images table not found or has different structure.")
-            sys.stdout.flush()
+        if not os.path.exists(db_path):
+            print(f"Error: Database file not found at {db_path}", file=out)
+            raise DatabaseError("Database file not found", db_path=db_path, 
+                              severity=ErrorSeverity.ERROR)
         
-        # Check characters table
+        own_conn = conn is None
         try:
-            cursor.execute("SELECT COUNT(*) FROM characters")
-            char_count = cursor.fetchone()[0]
-            print("\n=== CHARACTERS TABLE ===")
-            print(f"Total characters: {char_count}")
-            sys.stdout.flush()
+            # Connect to the database
+            if own_conn:
+                conn = connect_read_only(db_path)
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row  # Enable column access by name
             
-            if char_count > 0:
-                # Show character information (limit to 5)
-                try:
-                    cursor.execute("""
-                        SELECT id, story_id, name, description, image_url, created_at
-                        FROM characters LIMIT 5
-                    """)
-                    rows = cursor.fetchall()
-                    for row in rows:
-                        print(f"  Character ID: {row['id']}")
-                        print(f"  Story ID: {row['story_id']}")
-                        print(f"  Name: {row['name']}")
-                        print(f"  Description: {row['description']}")
-                        print(f"  Image URL: {row['image_url']}")
-                        print(f"  Created At: {row['created_at']}")
-                        print()
-                    sys.stdout.flush()
-                except sqlite3.OperationalError as e:
-                    print(f"  Error accessing character data: {str(e)}")
-                    sys.stdout.flush()
-        except sqlite3.OperationalError:
-            print("Characters table not found or has different structure.")
-            sys.stdout.flush()
-        
-        print_line("=")
-        print("Database exploration completed.")
-        sys.stdout.flush()
-        conn.close()
-        return True
-    except Exception as e:
-        print(f"Error exploring database: {str(e)}")
-        sys.stdout.flush()
-        raise DatabaseError("Failed to explore database contents", 
-                          db_path=db_path,
-                          severity=ErrorSeverity.ERROR, 
-                          details=str(e))
+            # Tables, columns and row counts, cached until the database changes
+            tables, columns, counts = _table_summary(cursor, db_path, fetch_batch)
+            
+            print("\nTables in database:", file=out)
+            for table_name in tables:
+                print(f"- {table_name}", file=out)
+                
+                lines = [f"  Columns in {table_name}:"]
+                lines.extend(f"    {col[1]} ({col[2]})" for col in columns.get(table_name, ()))
+                out.write("\n".join(lines) + "\n")
+                
+                print(f"  Row count: {counts[table_name]}", file=out)
+            
+            # Check for images table
+            print("\n--- DETAILS FOR SPECIFIC TABLES ---", file=out)
+            # Existence and size come from the summary above, not a probing query
+            if "images" in counts:
+                image_count = counts["images"]
+                print("\n=== IMAGES TABLE ===", file=out)
+                print(f"Total images: {image_count}", file=out)
+                
+                if image_count > 0:
+                    # Show image information (limit to 5)
+                    try:
+                        cursor.execute("""
+                            SELECT id, user_id, filename, path, type, width, height, created_at
+                            FROM images LIMIT 5
+                        """)
+                        for row in iter_rows(cursor, fetch_batch):
+                            out.write(
+                                f"  Image ID: {row['id']}\n"
+                                f"  User ID: {row['user_id']}\n"
+                                f"  Filename: {row['filename']}\n"
+                                f"  Path: {row['path']}\n"
+                                f"  Type: {row['type']}\n"
+                                f"  Dimensions: {row['width']}x{row['height']}\n"
+                                f"  Created At: {row['created_at']}\n\n"
+                            )
+                    except sqlite3.OperationalError as e:
+                        print(f"  Error accessing image data: {str(e)}", file=out)
+            else:
+                print("Images table not found or has different structure.", file=out)
+            
+            # Check characters table
+            # Existence and size come from the summary above, not a probing query
+            if "characters" in counts:
+                char_count = counts["characters"]
+                print("\n=== CHARACTERS TABLE ===", file=out)
+                print(f"Total characters: {char_count}", file=out)
+                
+                if char_count > 0:
+                    # Show character information (limit to 5)
+                    try:
+                        cursor.execute("""
+                            SELECT id, story_id, name, description, image_url, created_at
+                            FROM characters LIMIT 5
+                        """)
+                        for row in iter_rows(cursor, fetch_batch):
+                            out.write(
+                                f"  Character ID: {row['id']}\n"
+                                f"  Story ID: {row['story_id']}\n"
+                                f"  Name: {row['name']}\n"
+                                f"  Description: {row['description']}\n"
+                                f"  Image URL: {row['image_url']}\n"
+                                f"  Created At: {row['created_at']}\n\n"
+                            )
+                    except sqlite3.OperationalError as e:
+                        print(f"  Error accessing character data: {str(e)}", file=out)
+            else:
+                print("Characters table not found or has different structure.", file=out)
+            
+            print_line("=", out=out)
+            print("Database exploration completed.", file=out)
+            return True
+        except Exception as e:
+            print(f"Error exploring database: {str(e)}", file=out)
+            raise DatabaseError("Failed to explore database contents", 
+                              db_path=db_path,
+                              severity=ErrorSeverity.ERROR, 
+                              details=str(e))
+        finally:
+            if own_conn and conn is not None:
+                conn.close()
 
 @with_error_handling
-def dump_db_to_file(db_path=None, output_file="db_dump.txt"):
+def dump_db_to_file(db_path=None, output_file="db_dump.txt", fetch_batch=BATCH_SIZE, conn=None):
     """Dump database structure and contents to a file
     
     Args:
         db_path: Optional custom path for the database file
         output_file: Path to the output file
+        fetch_batch: Rows fetched per round trip when walking results
+        conn: Optional open connection to reuse; it is left open
     """
     if db_path is None:
         db_path = DEFAULT_DB_PATH
@@ -263,43 +450,33 @@ def dump_db_to_file(db_path=None, output_file="db_dump.txt"):
     print(f"\nDUMPING DATABASE TO FILE: {output_file}")
     print_line("=")
     print(f"Database path: {db_path}")
-    sys.stdout.flush()
     
     if not os.path.exists(db_path):
         print(f"Error: Database file not found at {db_path}")
-        sys.stdout.flush()
         raise DatabaseError("Database file not found", db_path=db_path, 
                           severity=ErrorSeverity.ERROR)
     
     try:
-        # Redirect stdout to a file
-        original_stdout = sys.stdout
-        with open(output_file, 'w') as f:
-            sys.stdout = f
-            
-            print(f"DATABASE DUMP FOR: {db_path}")
-            print(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print_line("=")
-            
-            # Execute structure check with output going to file
-            check_db_structure(db_path)
-            
-            # Execute content exploration with output going to file
-            explore_db_contents(db_path)
-            
-            print("\nEND OF DATABASE DUMP")
+        # Build the report in memory, then encode it once for the file
+        report = io.StringIO()
+        print(f"DATABASE DUMP FOR: {db_path}", file=report)
+        print(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", file=report)
+        print_line("=", out=report)
+        
+        # One pooled connection, and one read snapshot, serves both sections
+        with inspection_conn(db_path, conn) as conn:
+            check_db_structure(db_path, conn=conn, out=report, fetch_batch=fetch_batch)
+            explore_db_contents(db_path, conn=conn, out=report, fetch_batch=fetch_batch)
+        
+        print("\nEND OF DATABASE DUMP", file=report)
         
-        # Restore stdout
-        sys.stdout = original_stdout
+        with open(output_file, 'wb') as f:
+            f.write(report.getvalue().encode('utf-8'))
         
         print(f"Database dump completed. Output written to {output_file}")
-        sys.stdout.flush()
         return True
     except Exception as e:
-        # Restore stdout in case of error
-        sys.stdout = original_stdout
         print(f"Error dumping database to file: {str(e)}")
-        sys.stdout.flush()
         raise DatabaseError("Failed to dump database to file", 
                           db_path=db_path,
                           severity=ErrorSeverity.ERROR, 
@@ -3,14 +3,16 @@ Database utilities for managing the application database
 """
 
 import os
+import re
 import sys
+import time
+import atexit
 import sqlite3
-import importlib.util
-from pathlib import Path
 import logging
+from pathlib import Path
 from datetime import datetime, UTC
 from uuid import uuid4
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 
 from app.core.errors.management import (
     ManagementDatabaseError,
@@ -31,18 +33,83 @@ DEFAULT_DB_PATH = os.path.join(os.getcwd(), "storybook.db")
 # Log file path
 LOG_FILE_PATH = os.path.join(os.getcwd(), "logs", "db_operations.log")
 
+# Buffered handle to the log file, opened on first use and kept open; lines
+# reach the file in blocks and whatever is left is flushed on exit
+LOG_BUFFER_SIZE = 8192
+_LOG_FP = None
+
+# Application schema, read once from schema.sql and applied in a single
+# transaction by init_db
+SCHEMA_SQL = (Path(__file__).parent / "schema.sql").read_text(encoding="utf-8")
+# Counted from the script so the reported total follows schema changes
+SCHEMA_TABLE_COUNT = len(re.findall(r"^\s*CREATE\s+TABLE\b", SCHEMA_SQL, re.IGNORECASE | re.MULTILINE))
+
+# Tuning applied to every connection that writes the database. Foreign key
+# enforcement is left off: migrations rebuild tables in place.
+_WRITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    # Wait for a concurrent writer (e.g. the running backend) instead of failing
+    "PRAGMA busy_timeout=5000",
+)
+
+# Migration bookkeeping statements, built once rather than on every run
+_MIGRATIONS_TABLE_EXISTS = text(
+    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='migrations'"
+)
+_CREATE_MIGRATIONS_TABLE = text("""
+    CREATE TABLE migrations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+""")
+_APPLIED_MIGRATIONS = text("SELECT name FROM migrations")
+# Executed as one executemany per run
+_RECORD_MIGRATION = text("INSERT INTO migrations (name) VALUES (:name)")
+
+def _apply_pragmas(conn):
+    """Apply the write-side PRAGMAs to a DB-API sqlite3 connection"""
+    for pragma in _WRITE_PRAGMAS:
+        conn.execute(pragma)
+
+def _connect(db_path):
+    """Open a tuned read-write connection, creating the database if needed"""
+    conn = sqlite3.connect(db_path)
+    _apply_pragmas(conn)
+    return conn
+
+def _close(conn):
+    """Let SQLite refresh its planner statistics, then close the connection"""
+    try:
+        conn.execute("PRAGMA optimize")
+    except sqlite3.OperationalError:
+        pass
+    conn.close()
+
+def _log_file():
+    """Return the open log file, (re)opening it if LOG_FILE_PATH has moved"""
+    global _LOG_FP
+    if _LOG_FP is None or _LOG_FP.name != LOG_FILE_PATH:
+        if _LOG_FP is None:
+            atexit.register(lambda: _LOG_FP and _LOG_FP.close())
+        else:
+            _LOG_FP.close()
+        # The directory is created once, along with the handle
+        os.makedirs(os.path.dirname(LOG_FILE_PATH), exist_ok=True)
+        _LOG_FP = open(LOG_FILE_PATH, "a", buffering=LOG_BUFFER_SIZE)
+    return _LOG_FP
+
 def log_message(message):
     """Write a message to the log file and print it to console."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = f"[{timestamp}] {message}"
-    
-    # Ensure logs directory exists
-    os.makedirs(os.path.dirname(LOG_FILE_PATH), exist_ok=True)
+    log_entry = f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}"
     
     # Write to log file
     try:
-        with open(LOG_FILE_PATH, "a") as log_file:
-            log_file.write(log_entry + "\n")
+        _log_file().write(log_entry + "\n")
     except OSError as e:
         logger.warning(f"Could not write to log file: {str(e)}")
     
@@ -64,110 +131,16 @@ def init_db(db_path=None):
     
     try:
         # Connect to the database (will create it if it doesn't exist)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        conn = _connect(db_path)
         log_message("Connected to database")
         
-        # Create the migrations table to track applied migrations
-        log_message("Creating migrations table...")
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS migrations (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        # Create the users table
-        log_message("Creating users table...")
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            email TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL,
-            first_name TEXT NOT NULL,
-            last_name TEXT NOT NULL,
-            is_active BOOLEAN DEFAULT TRUE,
-            is_admin BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        
-        # Create stories table
-        log_message("Creating stories table...")
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS stories (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            age_range TEXT,
-            theme TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-        ''')
-        
-        # Create pages table
-        log_message("Creating pages table...")
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS pages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            story_id INTEGER NOT NULL,
-            page_number INTEGER NOT NULL,
-            content TEXT NOT NULL,
-            image_url TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (story_id) REFERENCES stories (id),
-            UNIQUE(story_id, page_number)
-        )
-        ''')
-        
-        # Create characters table
-        log_message("Creating characters table...")
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS characters (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            story_id INTEGER NOT NULL,
-            name TEXT NOT NULL,
-            description TEXT,
-            image_url TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (story_id) REFERENCES stories (id)
-        )
-        ''')
-        
-        # Create settings table
-        log_message("Creating settings table...")
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS settings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            key TEXT NOT NULL UNIQUE,
-            value TEXT,
-            description TEXT
-        )
-        ''')
-
-        # Create images table
-        log_message("Creating images table...")
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS images (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            filename TEXT NOT NULL,
-            path TEXT NOT NULL,
-            type TEXT NOT NULL,
-            width INTEGER,
-            height INTEGER,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-        ''')
-        
-        # Commit the changes and close the connection
-        conn.commit()
-        conn.close()
+        try:
+            # Create every table in one transaction and one pass through SQLite
+            conn.executescript(SCHEMA_SQL)
+            log_message(f"Created/verified {SCHEMA_TABLE_COUNT} tables")
+        finally:
+            # Closing also rolls back a failed script and releases its write lock
+            _close(conn)
         
         log_message("Database initialized successfully")
         log_message("=== INITIALIZATION COMPLETE ===\n")
@@ -196,6 +169,9 @@ def run_migrations(db_path=None):
     Args:
         db_path: Optional custom path for the database file
     """
+    # Only migrations load modules from files; keep it off the import path of init_db
+    import importlib.util
+    
     if db_path is None:
         db_path = DEFAULT_DB_PATH
     
@@ -223,13 +199,14 @@ def run_migrations(db_path=None):
                 )
             )
         
-        migration_files = []
-        
-        # Look for Python files in the migrations directory
-        for file_path in Path(migrations_dir).glob("*.py"):
-            if file_path.name.startswith("__"):
-                continue
-            migration_files.append(file_path)
+        # Look for Python files in the migrations directory in one scandir pass
+        with os.scandir(migrations_dir) as entries:
+            migration_files = [
+                entry for entry in entries
+                if entry.name.endswith(".py")
+                and not entry.name.startswith("__")
+                and entry.is_file()
+            ]
         
         if not migration_files:
             log_message("No migration files found.")
@@ -237,65 +214,70 @@ def run_migrations(db_path=None):
             return False
         
         # Sort migration files by name to ensure consistent order
-        migration_files.sort(key=lambda x: x.name)
+        migration_files.sort(key=lambda entry: entry.name)
         
         log_message(f"Found {len(migration_files)} migration files.")
         
         try:
             # Create SQLAlchemy engine
             engine = create_engine(f"sqlite:///{db_path}")
+            event.listen(engine, "connect", lambda dbapi_conn, _: _apply_pragmas(dbapi_conn))
             
-            # Create migrations table if it doesn't exist
-            with engine.connect() as conn:
-                conn.execute(text("""
-                    CREATE TABLE IF NOT EXISTS migrations (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL UNIQUE,
-                        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """))
-                conn.commit()
-            
-            # Get already applied migrations
-            with engine.connect() as conn:
-                result = conn.execute(text("SELECT name FROM migrations"))
-                applied_migrations = [row[0] for row in result]
+            # One short transaction both ensures the table and reads what is applied
+            with engine.begin() as conn:
+                # init_db normally creates the migrations table; only issue the
+                # DDL, and take the schema lock, when it is actually missing
+                if conn.execute(_MIGRATIONS_TABLE_EXISTS).first() is None:
+                    conn.execute(_CREATE_MIGRATIONS_TABLE)
+                
+                # Get already applied migrations
+                result = conn.execute(_APPLIED_MIGRATIONS)
+                applied_migrations = {row[0] for row in result}
             
             # Run migrations that haven't been applied yet
-            successful_migrations = 0
+            applied = []
             
-            for file_path in migration_files:
-                migration_name = file_path.stem
-                
-                if migration_name in applied_migrations:
-                    log_message(f"Migration {migration_name} already applied, skipping.")
-                    continue
-                
-                log_message(f"Applying migration: {migration_name}")
-                
-                try:
-                    # Load the migration module
-                    spec = importlib.util.spec_from_file_location(migration_name, file_path)
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
+            try:
+                for entry in migration_files:
+                    file_path = entry.path
+                    migration_name = entry.name[:-len(".py")]
                     
-                    # Run the migration
-                    if hasattr(module, "migrate"):
-                        module.migrate(engine)  # Pass the engine to the migrate function
+                    if migration_name in applied_migrations:
+                        log_message(f"Migration {migration_name} already applied, skipping.")
+                        continue
+                    
+                    log_message(f"Applying migration: {migration_name}")
+                    
+                    try:
+                        # Load the migration module. Only unapplied files get this far,
+                        # and the file loader reuses their __pycache__ bytecode
+                        spec = importlib.util.spec_from_file_location(migration_name, file_path)
+                        module = importlib.util.module_from_spec(spec)
+                        spec.loader.exec_module(module)
                         
-                        # Mark as applied
-                        with engine.connect() as conn:
-                            conn.execute(
-                                text("INSERT INTO migrations (name) VALUES (:name)"),
-                                {"name": migration_name}
+                        # Run the migration
+                        if hasattr(module, "migrate"):
+                            module.migrate(engine)  # Pass the engine to the migrate function
+                            applied.append(migration_name)
+                            log_message(f"Successfully applied migration: {migration_name}")
+                        else:
+                            raise ManagementDatabaseError(
+                                message=f"Migration {migration_name} has no migrate function",
+                                context=ErrorContext(
+                                    source="management.db_utils.run_migrations",
+                                    severity=ErrorSeverity.ERROR,
+                                    timestamp=datetime.now(UTC),
+                                    error_id=str(uuid4()),
+                                    additional_data={
+                                        "migration_name": migration_name,
+                                        "file_path": str(file_path)
+                                    }
+                                )
                             )
-                            conn.commit()
-                        
-                        successful_migrations += 1
-                        log_message(f"Successfully applied migration: {migration_name}")
-                    else:
+                            
+                    except Exception as e:
                         raise ManagementDatabaseError(
-                            message=f"Migration {migration_name} has no migrate function",
+                            message=f"Failed to apply migration {migration_name}",
                             context=ErrorContext(
                                 source="management.db_utils.run_migrations",
                                 severity=ErrorSeverity.ERROR,
@@ -303,26 +285,24 @@ def run_migrations(db_path=None):
                                 error_id=str(uuid4()),
                                 additional_data={
                                     "migration_name": migration_name,
-                                    "file_path": str(file_path)
+                                    "file_path": str(file_path),
+                                    "error": str(e)
                                 }
                             )
                         )
-                        
-                except Exception as e:
-                    raise ManagementDatabaseError(
-                        message=f"Failed to apply migration {migration_name}",
-                        context=ErrorContext(
-                            source="management.db_utils.run_migrations",
-                            severity=ErrorSeverity.ERROR,
-                            timestamp=datetime.now(UTC),
-                            error_id=str(uuid4()),
-                            additional_data={
-                                "migration_name": migration_name,
-                                "file_path": str(file_path),
-                                "error": str(e)
-                            }
+            finally:
+                # Record whatever ran, even if a later migration failed, in one
+                # transaction, then refresh planner statistics after the changes
+                if applied:
+                    with engine.begin() as conn:
+                        conn.execute(
+                            _RECORD_MIGRATION,
+                            [{"name": name} for name in applied]
                         )
-                    )
+                        conn.execute(text("PRAGMA optimize"))
+            
+            successful_migrations = len(applied)
+            engine.dispose()
             
             log_message(f"Successfully applied {successful_migrations} migrations")
             log_message("=== MIGRATION COMPLETE ===\n")
@@ -7,7 +7,6 @@ import argparse
 import traceback
 import signal
 import platform
-import time
 import threading
 import logging
 import asyncio
@@ -25,7 +24,7 @@ from .commands import (
     start_backend, start_frontend, stop_server, restart_server,
     run_db_init, run_migrations,
     check_db_structure, explore_db_contents, dump_db_to_file,
-    check_characters, check_images, 
+    check_characters, check_images, check_content, inspect_all, inspect_all_parallel,
     start_concurrent_mode
 )
 # Import environment management commands
@@ -160,6 +159,33 @@ def parse_args():
     # Cleanup command
     cleanup_parser = subparsers.add_parser("cleanup", help="Clean up stale PID files")
     
+    # Full database inspection command
+    inspect_parser = subparsers.add_parser(
+        "inspect-all",
+        help="Run all database and content inspections over one connection"
+    )
+    inspect_parser.add_argument(
+        "--db-path",
+        default=None,
+        help="Path to the database file (default: storybook.db)"
+    )
+    inspect_parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Run the structure, character and image checks concurrently"
+    )
+    
+    # Combined character and image check
+    content_parser = subparsers.add_parser(
+        "check-content",
+        help="Summarise characters and images per story in one pass"
+    )
+    content_parser.add_argument(
+        "--db-path",
+        default=None,
+        help="Path to the database file (default: storybook.db)"
+    )
+    
     # Dashboard command
     dashboard_parser = subparsers.add_parser("dashboard", help="Start the web dashboard for managing servers")
     dashboard_parser.add_argument(
@@ -236,11 +262,17 @@ async def main():
         
         elif args.command == "restart":
             if args.unified_mode:
-                await stop_server("backend", force=True)
-                await stop_server("frontend", force=True)
+                stopped = [
+                    await stop_server("backend", force=True),
+                    await stop_server("frontend", force=True)
+                ]
                 if args.with_dashboard:
-                    await stop_server("dashboard", force=True)
-                time.sleep(1)  # Give servers time to stop
+                    stopped.append(await stop_server("dashboard", force=True))
+                # stop_server waits for each process to exit, and reports a timeout
+                # rather than leaving the new servers to race the old ones for ports
+                if not all(stopped):
+                    logger.error("A server did not exit in time; not restarting. Run 'stop' and try again.")
+                    return
                 await start_concurrent_mode(args)
             else:
                 if not args.backend and not args.frontend:
@@ -300,6 +332,15 @@ async def main():
         elif args.command == "check-images":
             await check_images(args.db_path)
         
+        elif args.command == "check-content":
+            await check_content(args.db_path)
+        
+        elif args.command == "inspect-all":
+            if args.parallel:
+                await inspect_all_parallel(args.db_path)
+            else:
+                await inspect_all(args.db_path)
+        
         elif args.command == "env":
             if args.env_command == "setup":
                 return await setup_environment(auto_mode=args.auto)
@@ -374,4 +415,7 @@ async def main():
         raise ProcessError("CLI execution failed", context=context) from e
 
 if __name__ == "__main__":
+    # Let the runtime flush stdout at each newline instead of flushing by hand
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=True)
     asyncio.run(main()) 
\ No newline at end of file
@@ -5,8 +5,9 @@ PID file utilities for managing server processes
 import os
 import psutil
 import platform
+import select
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 import time
 import logging
 
@@ -28,6 +29,30 @@ logger = setup_logger(
 PROJECT_ROOT = Path(__file__).parent.parent
 PID_DIR = PROJECT_ROOT / ".pids"
 
+_IS_WINDOWS = platform.system() == "Windows"
+if _IS_WINDOWS:
+    # Probe processes through kernel32 directly rather than a psutil snapshot
+    import ctypes
+    from ctypes import wintypes
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _OpenProcess = _kernel32.OpenProcess
+    _OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _OpenProcess.restype = wintypes.HANDLE
+    _WaitForSingleObject = _kernel32.WaitForSingleObject
+    _WaitForSingleObject.argtypes = (wintypes.HANDLE, wintypes.DWORD)
+    _WaitForSingleObject.restype = wintypes.DWORD
+    _CloseHandle = _kernel32.CloseHandle
+    _CloseHandle.argtypes = (wintypes.HANDLE,)
+    _SYNCHRONIZE = 0x00100000
+    _WAIT_TIMEOUT = 0x00000102
+    _ERROR_ACCESS_DENIED = 5
+
+# Linux 5.3+ can hand out a pollable descriptor that becomes readable on exit
+_HAS_PIDFD = hasattr(os, "pidfd_open") and hasattr(select, "poll")
+
+# Parsed PID file contents keyed by server type, validated by file mtime
+_PID_CACHE: Dict[str, Tuple[int, Optional[int]]] = {}
+
 @with_management_error_handling
 def ensure_pid_dir():
     """Ensure the PID directory exists"""
@@ -35,7 +60,6 @@ def ensure_pid_dir():
 
 def get_pid_file(server_type: str) -> Path:
     """Get the path to a PID file"""
-    ensure_pid_dir()
     return PID_DIR / f"{server_type}.pid"
 
 def is_process_running(pid: int) -> bool:
@@ -44,30 +68,135 @@ def is_process_running(pid: int) -> bool:
         # Special handling for marker PIDs
         if pid in [99999, 88888]:
             return True
-            
-        process = psutil.Process(pid)
-        return process.is_running()
-    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        
+        if _IS_WINDOWS:
+            handle = _OpenProcess(_SYNCHRONIZE, False, pid)
+            if not handle:
+                # The process exists but belongs to someone we can't open
+                return ctypes.get_last_error() == _ERROR_ACCESS_DENIED
+            try:
+                # A handle can outlive the process; only an unsignalled one is running
+                return _WaitForSingleObject(handle, 0) == _WAIT_TIMEOUT
+            finally:
+                _CloseHandle(handle)
+        
+        # Signal 0 checks existence and permissions without delivering anything
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # The process exists but belongs to another user
+        return True
+
+def wait_for_exit(pid: int, timeout: float = 5.0) -> bool:
+    """Block until a process exits or the timeout elapses
+    
+    Sleeps on the kernel's exit notification where one is available (a
+    pidfd on Linux, a process handle on Windows) and falls back to psutil
+    otherwise.
+    
+    Args:
+        pid: Process ID to wait for
+        timeout: Maximum number of seconds to wait
+        
+    Returns:
+        bool: True if the process is gone, False if it is still running
+    """
+    if pid in [99999, 88888]:
+        return False
+    
+    if _IS_WINDOWS:
+        handle = _OpenProcess(_SYNCHRONIZE, False, pid)
+        if handle:
+            try:
+                return _WaitForSingleObject(handle, int(timeout * 1000)) != _WAIT_TIMEOUT
+            finally:
+                _CloseHandle(handle)
+        if ctypes.get_last_error() != _ERROR_ACCESS_DENIED:
+            return True
+    elif _HAS_PIDFD:
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return True
+        except OSError:
+            # ENOSYS on older kernels, EPERM in some sandboxes; use psutil instead
+            pidfd = None
+        if pidfd is not None:
+            try:
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+                return bool(poller.poll(timeout * 1000))
+            finally:
+                os.close(pidfd)
+    
+    try:
+        psutil.Process(pid).wait(timeout=timeout)
+        return True
+    except psutil.NoSuchProcess:
+        return True
+    except (psutil.TimeoutExpired, psutil.AccessDenied):
         return False
 
 @with_management_error_handling
 def save_pid(server_type: str, pid: int):
     """Save a PID to file"""
     pid_file = get_pid_file(server_type)
-    with open(pid_file, 'w') as f:
-        f.write(str(pid))
+    _PID_CACHE.pop(server_type, None)
+    # Recreate the directory if it was removed since the last write
+    PID_DIR.mkdir(exist_ok=True)
+    # Write beside the target and rename over it so readers never see a partial PID
+    tmp_file = f"{pid_file}.tmp"
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, f"{pid}\n".encode())
+    finally:
+        os.close(fd)
+    os.replace(tmp_file, pid_file)
 
 @with_management_error_handling
 def get_pid(server_type: str) -> Optional[int]:
-    """Get a PID from file if it exists"""
+    """Get a PID from file if it exists
+    
+    While the file is unchanged this costs a single stat(): the parsed PID
+    is reused until the file's mtime moves, so the file is only opened
+    and read after save_pid or an outside write replaces it.
+    """
     pid_file = get_pid_file(server_type)
-    if pid_file.exists():
+    try:
+        mtime = os.stat(pid_file).st_mtime_ns
+    except FileNotFoundError:
+        _PID_CACHE.pop(server_type, None)
+        return None
+    
+    cached = _PID_CACHE.get(server_type)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    try:
+        fd = os.open(pid_file, os.O_RDONLY)
         try:
-            with open(pid_file) as f:
-                return int(f.read().strip())
-        except (ValueError, IOError):
-            return None
-    return None
+            pid = int(os.read(fd, 32).strip())
+        finally:
+            os.close(fd)
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not read PID file {pid_file}: {e}")
+        pid = None
+    
+    _PID_CACHE[server_type] = (mtime, pid)
+    return pid
+
+@with_management_error_handling
+def remove_pid_file(server_type: str):
+    """Remove a PID file if it exists"""
+    _PID_CACHE.pop(server_type, None)
+    try:
+        os.remove(get_pid_file(server_type))
+    except FileNotFoundError:
+        pass
 
 @with_management_error_handling
 async def cleanup_pid_files():
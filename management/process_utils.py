@@ -0,0 +1,65 @@
+"""
+Process launching utilities shared by the CLI commands and the dashboard
+"""
+
+import os
+import shutil
+import platform
+import subprocess
+from typing import Optional, Dict, Any, List
+
+_IS_WINDOWS = platform.system() == "Windows"
+
+# Executable lookups resolved via PATH, cached for the life of the process
+_EXE_CACHE: Dict[str, Optional[str]] = {}
+
+
+def which(name: str) -> Optional[str]:
+    """Look an executable up on PATH once, returning None if it is missing"""
+    try:
+        return _EXE_CACHE[name]
+    except KeyError:
+        exe = _EXE_CACHE[name] = shutil.which(name)
+        return exe
+
+
+def resolve_exe(name: str) -> str:
+    """Resolve an executable to its full path, falling back to the bare name"""
+    return which(name) or name
+
+
+def frontend_dir() -> Optional[str]:
+    """Absolute path of the frontend project, or None if it is missing
+
+    The frontend is started with cwd= set to this path, which changes
+    directory in the child only; os.chdir here would race other threads.
+    """
+    path = os.path.abspath("frontend")
+    return path if os.path.isdir(path) else None
+
+
+def detach_kwargs(detach: bool) -> Dict[str, Any]:
+    """Process creation options that detach a server from this terminal"""
+    if not detach:
+        return {}
+    if _IS_WINDOWS:
+        return {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    # setsid() runs in the child from C, with no Python callback after fork
+    return {"start_new_session": True}
+
+
+def spawn(cmd: List[str], *, detach: bool = False, cwd: Optional[str] = None) -> subprocess.Popen:
+    """Start a server process directly, without an intermediate shell
+
+    Attached servers share this terminal's output; detached servers have
+    their output discarded and run in their own session.
+    """
+    if not detach:
+        return subprocess.Popen(cmd, cwd=cwd)
+    return subprocess.Popen(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=cwd,
+        **detach_kwargs(detach)
+    )
@@ -3,6 +3,9 @@ Tests for management command functionality.
 """
 import os
 import sys
+import asyncio
+import sqlite3
+import subprocess
 from unittest.mock import patch, MagicMock, mock_open
 from pathlib import Path
 import pytest
@@ -22,8 +25,14 @@ from management.commands import (
     check_images,
     start_frontend,
     start_backend,
-    stop_server
+    stop_server,
+    restart_server,
+    inspect_all_parallel,
+    check_content,
+    _take_lines
 )
+from management.process_utils import spawn
+from management.db_utils import init_db
 from app.database.models import User, Character, Story
 from app.core.security import get_password_hash
 
@@ -45,6 +54,21 @@ def test_user(test_db_session):
     return user
 
 
+@pytest.fixture
+def inspect_db(tmp_path):
+    """Create an empty database with the tables the inspections read."""
+    db_path = tmp_path / "inspect.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE characters (id INTEGER PRIMARY KEY, story_id INTEGER, name TEXT,
+            description TEXT, image_url TEXT, created_at TIMESTAMP);
+        CREATE TABLE images (id INTEGER PRIMARY KEY, user_id INTEGER, filename TEXT,
+            path TEXT, type TEXT, width INTEGER, height INTEGER, created_at TIMESTAMP);
+    """)
+    conn.close()
+    return db_path
+
+
 class TestBackendCommands:
     @patch('management.commands.get_pid')
     @patch('management.commands.subprocess.Popen')
@@ -253,6 +277,23 @@ class TestStopCommands:
                 stop_server("backend")
             except Exception:
                 pass  # We expect an exception
+    
+    @patch('management.commands._IS_LINUX', False)
+    @patch('management.commands.get_pid', return_value=12345)
+    @patch('management.commands.kill_process', return_value=True)
+    @patch('management.commands.wait_for_exit', return_value=False)
+    @patch('management.commands.remove_pid_file')
+    def test_stop_server_reports_exit_timeout(self, mock_remove, mock_wait, mock_kill, mock_get_pid):
+        """A server still running after the exit wait is reported, and its PID file kept."""
+        assert asyncio.run(stop_server("backend")) is False
+        mock_remove.assert_not_called()
+    
+    @patch('management.commands.stop_server', return_value=False)
+    @patch('management.commands.start_backend')
+    def test_restart_server_skips_start_on_exit_timeout(self, mock_start, mock_stop):
+        """Restart does not race a server that has not exited for its port."""
+        asyncio.run(restart_server("backend", None))
+        mock_start.assert_not_called()
 
 
 class TestDatabaseCommands:
@@ -659,4 +700,146 @@ class TestRunTestsScript:
         assert '--no-header' in cmd
         
         # Verify the return code
-        assert result == 0 
\ No newline at end of file
+        assert result == 0 
+
+
+class TestOutputHelpers:
+    """Tests for the unified-mode output helpers."""
+    
+    def test_take_lines_keeps_partial_line(self):
+        """Lines split across reads are reassembled and a trailing partial line is kept."""
+        buf = bytearray(b"first\nsec")
+        assert _take_lines(buf) == ["first"]
+        assert buf == b"sec"
+        
+        buf += b"ond\nthird"
+        assert _take_lines(buf) == ["second"]
+        assert buf == b"third"
+    
+    def test_take_lines_groups_lines_per_read(self):
+        """All complete lines from a single read come back together."""
+        buf = bytearray(b"a\nb\nc\npartial")
+        assert _take_lines(buf) == ["a", "b", "c"]
+        assert _take_lines(buf) == []
+        assert buf == b"partial"
+
+
+class TestSpawn:
+    """Tests for the server process launcher."""
+    
+    @patch('management.process_utils.subprocess.Popen')
+    def test_spawn_detached_execs_server_directly(self, mock_popen):
+        """Detached servers are exec'd without a shell, so their own PID is recorded."""
+        cmd = ["uvicorn", "app.main:app", "--port", "8000"]
+        spawn(cmd, detach=True)
+        
+        args, kwargs = mock_popen.call_args
+        assert args == (cmd,)
+        assert "shell" not in kwargs
+        assert kwargs["stdout"] is subprocess.DEVNULL
+    
+    @pytest.mark.skipif(sys.platform == "win32", reason="sessions are a POSIX concept")
+    def test_spawn_detached_leads_new_session(self):
+        """A detached server leads its own session rather than sharing ours."""
+        process = spawn([sys.executable, "-c", "import time; time.sleep(0.2)"], detach=True)
+        try:
+            assert os.getsid(process.pid) == process.pid
+        finally:
+            process.wait()
+
+
+class TestParallelInspection:
+    """Tests for the concurrent inspection command."""
+    
+    def test_inspect_all_parallel_prints_reports_in_order(self, inspect_db, capsys):
+        """Each worker's report is printed whole and in a fixed order."""
+        assert asyncio.run(inspect_all_parallel(str(inspect_db))) is True
+        
+        output = capsys.readouterr().out
+        structure = output.index("DATABASE STRUCTURE CHECK")
+        characters = output.index("CHARACTER INSPECTION")
+        images = output.index("IMAGE INSPECTION")
+        assert structure < output.index("Database structure check completed.") < characters
+        assert characters < output.index("Character inspection completed.") < images
+    
+    def test_inspect_all_parallel_reports_deleted_database(self, inspect_db):
+        """A database removed after its first inspection is reported as not found."""
+        assert asyncio.run(inspect_all_parallel(str(inspect_db))) is True
+        
+        inspect_db.unlink()
+        with pytest.raises(DatabaseError) as exc_info:
+            asyncio.run(inspect_all_parallel(str(inspect_db)))
+        assert exc_info.value.error_code == "DATABASE-INSPECT-FILE-NOT-FOUND-001"
+
+
+class TestReplacedDatabase:
+    """Tests for inspecting a database that is replaced at the same path."""
+    
+    def test_inspection_sees_recreated_database(self, tmp_path, capsys):
+        """Pooled connections and cached structure do not outlive the file."""
+        db_path = tmp_path / "inspect.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE old_table (id INTEGER PRIMARY KEY)")
+        conn.close()
+        assert asyncio.run(check_db_structure(str(db_path))) is True
+        assert "TABLE: old_table" in capsys.readouterr().out
+        
+        db_path.unlink()
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE new_table (id INTEGER PRIMARY KEY)")
+        conn.close()
+        assert asyncio.run(check_db_structure(str(db_path))) is True
+        output = capsys.readouterr().out
+        assert "TABLE: new_table" in output
+        assert "old_table" not in output
+
+
+class TestInspectionCommandArgs:
+    """Tests for positional argument handling in the inspection commands."""
+    
+    def test_check_db_structure_accepts_verbose(self, inspect_db):
+        """The legacy verbose flag is still accepted."""
+        assert asyncio.run(check_db_structure(str(inspect_db), True)) is True
+    
+    def test_surplus_positional_args_raise(self, inspect_db):
+        """Positional arguments beyond the signature are rejected, not dropped."""
+        with pytest.raises(TypeError):
+            asyncio.run(check_db_structure(str(inspect_db), True, "extra"))
+        with pytest.raises(TypeError):
+            asyncio.run(explore_db_contents(str(inspect_db), True))
+
+
+class TestContentCheck:
+    """Tests for the combined character and image check."""
+    
+    def test_check_content_counts_per_story(self, tmp_path, capsys):
+        """Characters are counted per story and images per story author."""
+        db_path = str(tmp_path / "content.db")
+        init_db(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            INSERT INTO users (id, username, email, password_hash, first_name, last_name)
+                VALUES (1, 'a', 'a@example.com', 'x', 'A', 'A'),
+                       (2, 'b', 'b@example.com', 'x', 'B', 'B');
+            INSERT INTO stories (id, user_id, title)
+                VALUES (1, 1, 'First'), (2, 2, 'Second');
+            INSERT INTO characters (story_id, name) VALUES (1, 'Ann'), (1, 'Bob');
+            INSERT INTO images (user_id, filename, path, type) VALUES (2, 'f.png', 'f.png', 'png');
+        """)
+        conn.commit()
+        conn.close()
+        
+        assert asyncio.run(check_content(db_path)) is True
+        
+        output = capsys.readouterr().out
+        assert "Story 1 (First): 2 characters, 0 images owned by user 1" in output
+        assert "Story 2 (Second): 0 characters, 1 images owned by user 2" in output
+        assert "STORIES WITHOUT CHARACTERS: 1" in output
+    
+    def test_check_content_reports_sql_failure(self, inspect_db, capsys):
+        """A failing query surfaces its SQLite error rather than a TypeError."""
+        with pytest.raises(DatabaseError) as exc_info:
+            asyncio.run(check_content(str(inspect_db)))
+        assert exc_info.value.error_code == "DATABASE-CONTENT-FAILURE-001"
+        assert "no such table: stories" in str(exc_info.value.__cause__)
+        assert "no such table: stories" in capsys.readouterr().out
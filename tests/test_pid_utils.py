@@ -0,0 +1,74 @@
+"""
+Tests for PID file and process utilities
+"""
+import subprocess
+import pytest
+
+from management import pid_utils
+from management.pid_utils import is_process_running, wait_for_exit
+
+
+@pytest.fixture(params=["pidfd", "psutil"])
+def wait_path(request, monkeypatch):
+    """Run a test against the pidfd path and again against the psutil fallback."""
+    if request.param == "pidfd":
+        if not pid_utils._HAS_PIDFD:
+            pytest.skip("pidfd_open is not available on this platform")
+    else:
+        monkeypatch.setattr(pid_utils, "_HAS_PIDFD", False)
+    return request.param
+
+
+def test_wait_for_exit_returns_when_process_exits(wait_path):
+    """Test that wait_for_exit wakes up as soon as the process is gone"""
+    process = subprocess.Popen(["sleep", "0.2"])
+    try:
+        assert wait_for_exit(process.pid, timeout=5.0) is True
+    finally:
+        process.wait()
+
+
+def test_wait_for_exit_times_out_on_running_process(wait_path):
+    """Test that wait_for_exit reports a process that outlives the timeout"""
+    process = subprocess.Popen(["sleep", "5"])
+    try:
+        assert wait_for_exit(process.pid, timeout=0.1) is False
+    finally:
+        process.kill()
+        process.wait()
+
+
+@pytest.mark.parametrize("marker_pid", [99999, 88888])
+def test_wait_for_exit_marker_pid(marker_pid):
+    """Test that marker PIDs are never reported as exited"""
+    assert wait_for_exit(marker_pid, timeout=0.1) is False
+
+
+def test_is_process_running_live_and_reaped():
+    """Test that a live child is running and a reaped one is not"""
+    process = subprocess.Popen(["sleep", "5"])
+    assert is_process_running(process.pid) is True
+    process.kill()
+    process.wait()
+    assert is_process_running(process.pid) is False
+
+
+def test_is_process_running_other_users_process(monkeypatch):
+    """Test that a process we may not signal still counts as running"""
+    def deny(pid, sig):
+        raise PermissionError
+    monkeypatch.setattr(pid_utils.os, "kill", deny)
+    assert is_process_running(12345) is True
+
+
+def test_save_pid_recreates_removed_pid_dir(tmp_path, monkeypatch):
+    """Test that save_pid still works after the PID directory is deleted"""
+    pid_dir = tmp_path / ".pids"
+    monkeypatch.setattr(pid_utils, "PID_DIR", pid_dir)
+    pid_utils.save_pid("backend", 1234)
+    assert pid_utils.get_pid("backend") == 1234
+    
+    pid_utils.remove_pid_file("backend")
+    pid_dir.rmdir()
+    pid_utils.save_pid("backend", 5678)
+    assert pid_utils.get_pid("backend") == 5678